@@ -3,6 +3,13 @@ from pybaseball import schedule_and_record
 import pandas as pd
 import requests
 import time
+import json
+
+from tools import ResponseCache
+from tools import Replay
+
+# REPLAY_URL (when set) points the upstream requests at the local stand-in, tools/Replay.py
+Replay.install()
 
 pd.options.mode.copy_on_write = False
 mlb_teams = [
@@ -25,6 +32,17 @@ def safe_schedule(year, team):
             time.sleep(2)
     return None
 
+# The season page changes every day, so a cached schedule outlives reruns of
+# the day's job (the workflow restores the cache) but never the next nightly run
+SCHEDULE_TTL = 20 * 60 * 60
+
+def cached_schedule(year, team):
+    def fetch():
+        schedule = safe_schedule(year, team)
+        return None if schedule is None else json.loads(schedule.to_json(orient='split'))
+    payload = ResponseCache.cached_json(f"bref/schedule_and_record/{year}/{team}", None, fetch, ttl=SCHEDULE_TTL)
+    return None if payload is None else pd.DataFrame(**payload)
+
 # Fetch schedule and record data for all MLB teams
 schedule_records = []
 for team in mlb_teams:
@@ -33,7 +51,7 @@ for team in mlb_teams:
     # print(team, resp.status_code)
     # print(resp.text[:500])
     print(f"FETCHING schedule and record for {team} in 2026")
-    schedule_records.append(safe_schedule(2026, team))
+    schedule_records.append(cached_schedule(2026, team))
     print(f"Fetched schedule and record for {team} in 2026")
 
 # Concatenate all schedule records into a single DataFrame
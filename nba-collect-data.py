@@ -1,102 +1,79 @@
-import requests
 import json
+import sys
 import datetime
 from datetime import datetime, timedelta
 import pandas as pd
 
-# Generate list of dates from October 21, 2025 to today
-start_date = datetime(2025, 10, 21)
-end_date = datetime.now()
+from tools import ESPNScoreboard
+from tools import NBAScores
+from tools import NBALedger
+from tools import NBAProfiles
+from tools import NBAElo
+from tools import NBAAsOf
+from tools import Replay
 
-dates = []
-current_date = start_date
-while current_date <= end_date:
-    dates.append(current_date.strftime("%Y%m%d"))
-    current_date += timedelta(days=1)
+# REPLAY_URL (when set) points the upstream requests at the local stand-in, tools/Replay.py
+Replay.install()
 
-#print(dates)
+# Collected scores so far; a file without Date / Event ID columns is refetched from October 21, 2025
+scores = NBAScores.load_scores()
+bootstrap = scores is None
 
-def appendData(team, today=False):
-    #If we are getting today's data, only get team names
-    if today:
-        try:
-            return [
-                team['team']['displayName'],
-                team['team']['abbreviation'],
-                team['team']['id']            
-            ]
-        # If team is missing score for a postponed game, return blank dataframe
-        except: return [None,None,None,None]
+# Dates from the last collected date (late finishes and corrections) to today,
+# after the dates whose fetch failed on an earlier run
+new_dates = NBAScores.fetch_dates(scores)
+retry_dates = [d for d in ESPNScoreboard.load_failed_dates(NBAScores.FAILED_DATES_PATH) if d not in new_dates]
+dates = retry_dates + new_dates
 
-    #If we are getting historical data, get teams and scores since game has happened
-    else:
-        # Append team data with error handling for missing line scores
-        try:
-            return [
-                team['team']['displayName'],
-                team['team']['abbreviation'],
-                team['team']['id'],
-                int(team['score']),
-                team['linescores'][0]['value'],
-                team['linescores'][1]['value'],
-                team['linescores'][2]['value'],
-                team['linescores'][3]['value']
-            ]
-        # If team is missing score for a postponed game, return blank dataframe
-        except: return [None,None,None,None,None,None,None,None]
+# Fetch every date concurrently on one pooled session, results in date order.
+# Retried dates and the already-collected tail date bypass the response cache
+# so the refetch sees ESPN's corrections
+print(f"Fetching data for {len(dates)} dates ({len(retry_dates)} retried)")
+tail = len(retry_dates) + (0 if bootstrap else 1)
+scoreboards = (ESPNScoreboard.fetch_scoreboards('nba', dates[:tail], use_cache=False)
+               + ESPNScoreboard.fetch_scoreboards('nba', dates[tail:]))
+failed = ESPNScoreboard.failed_dates(dates, scoreboards)
 
-def get_nba_historical_scoreboard(date):
-    # Fetch NBA scoreboard data for a specific date
-    url = f"https://site.api.espn.com/apis/site/v2/sports/basketball/nba/scoreboard?dates={date}"
-    try:
-        # Call requests
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()  # Raise error for bad status codes
-        data = response.json()
-        # Save JSON
-        #with open('data/nba_scoreboard.json', 'w') as f:
-            #json.dump(data, f, indent=2)
+# Collect one record per completed game
+records = []
+for date, data in zip(dates, scoreboards):
+    if data is None:
+        continue
+    ESPNScoreboard.nba_game_records(date, data, records)
 
-        #Find games
-        games = data.get("events", [])
-        if not games:
-            print("No games found.")
-            return
+# Upsert by event id and replace the file atomically
+curr_season_scores, added, corrected = NBAScores.upsert_scores(scores, records)
+NBAScores.save_scores(curr_season_scores)
+ESPNScoreboard.save_failed_dates(failed, NBAScores.FAILED_DATES_PATH)
+print(f"All data fetched: {added} new games, {corrected} corrected.")
 
-        #initialize a dataframe to store daily scoreboard info
-        game_info = []
+# Games of retried dates land before rows already collected, like corrections
+# they change earlier rows
+retried = set(retry_dates) - set(failed)
+backfilled = any(record[0].replace('-', '') in retried for record in records)
+rebuild = bootstrap or corrected or backfilled
 
-        #For each game, get game info
-        for game in games:
-            #Teams
-            teams = game["competitions"][0]["competitors"]
-            #Home
-            home = teams[0]
-            #Away
-            away = teams[1]
-            #Append data
-            game_info.append(appendData(home) + appendData(away))
+# Date-ordered team-game ledger, extended with the rows added since the last run
+# (rebuilt when earlier rows changed)
+ledger = None if rebuild else NBALedger.load_ledger()
+ledger = NBALedger.update_ledger(ledger, curr_season_scores)
+NBALedger.save_ledger(ledger)
 
-        return pd.DataFrame(game_info, columns=[
-            'Home Team', 'Home Abbreviation', 'Home ID', 'Home Score',
-            'Home Q1', 'Home Q2', 'Home Q3', 'Home Q4',
-            'Away Team', 'Away Abbreviation', 'Away ID', 'Away Score',
-            'Away Q1', 'Away Q2', 'Away Q3', 'Away Q4'
-        ])
+# Team profiles (home/away splits and form per team id) for the daily page
+NBAProfiles.save_profiles(NBAProfiles.build_profiles(curr_season_scores, ledger))
+print("Team profiles saved.")
 
-    except requests.RequestException as e:
-        print(f"Error fetching data: {e}")
+# Elo ratings, updated with the games not rated yet (re-rated from scratch when earlier rows changed)
+elo = None if rebuild else NBAElo.load_elo()
+elo = NBAElo.update_elo(elo, curr_season_scores)
+NBAElo.save_elo(elo)
+print("Elo ratings saved.")
 
-#curr_season_scores = get_nba_historical_scoreboard("20260108")
-#curr_season_scores
+# Insight backtest over every past slate, so the daily page only reads the table
+NBAAsOf.save_backtest(NBAAsOf.backtest(NBAAsOf.historical_slates(curr_season_scores)))
+print("Insight backtest saved.")
 
-curr_season_scores = pd.DataFrame()
-
-for i in dates:
-    print(f"Fetching data for date: {i}")
-    curr_season_scores = pd.concat([curr_season_scores, get_nba_historical_scoreboard(i)], axis=0)
-    print(f"Completed for date: {i}")
-    print("-" * 40)
-
-print("All data fetched.")
-curr_season_scores.to_csv('data/nba_scores_2025_2026.csv', index=False)
+# Fail the run (after saving everything) so a missed date is noticed; it is retried next run
+if failed:
+    print(f"Could not fetch {len(failed)} dates, will retry next run: {', '.join(failed)}")
+    sys.exit(1)
@@ -0,0 +1,11 @@
+from tools import NRFIModel
+from tools import Replay
+
+# REPLAY_URL (when set) points the upstream requests at the local stand-in, tools/Replay.py
+Replay.install()
+
+# Run the full NRFI pipeline once (season replay, model, probable starters,
+# prices) and save today's slate for the NRFI page to render
+slate = NRFIModel.buildSlate()
+NRFIModel.saveSlate(slate)
+print(f"Saved {len(slate['probStarters'])} games for {slate['date']} to {NRFIModel.SLATE_PATH}")
@@ -1,19 +1,32 @@
-import pybaseball as pyb
-from datetime import datetime
+from tools import NRFIFeatures
+from tools import NRFIState
+from tools import StatcastShards
+from tools import Replay
 
-# 2025-26
-# Pull all Statcast events for the date
-pyb.cache.enable()
-todayx = datetime.today().strftime('%Y-%m-%d')
-nrfi = pyb.statcast(start_dt='2026-03-25', end_dt=todayx)
+# REPLAY_URL (when set) points the upstream requests at the local stand-in, tools/Replay.py
+Replay.install()
 
-#keep only the columns we need for the model
-cols = ['home_team', 'away_team', 'inning', 'player_name', 'pitcher', 
-        'home_score', 'away_score', 'game_pk']
+# 2025-26
+# Pull Statcast only for the finished days that are not stored yet, several days at a time
+written, failed = StatcastShards.ingest(start=StatcastShards.SEASON_START)
+print(f"Fetched {len(written)} new days of Statcast")
+for day, error in sorted(failed.items()):
+    print(f"Could not fetch {day} ({error}), will retry next run")
 
-# get first inning data with only specific columns
-df1 = nrfi[nrfi['inning'] == 1]
-df2 = df1[cols].reset_index(drop=True)
+# compact the stored first-inning pitches to one row per game, one day at a time,
+# and save as parquet for faster loading
+games = StatcastShards.build_games(start=StatcastShards.SEASON_START)
+# every shard row carries its game_date; an undated table would break the as-of features
+undated = games['game_date'].isna().sum()
+if undated:
+    raise ValueError(f"{undated} of {len(games)} games have no game_date, not writing {NRFIFeatures.GAMES_PATH}")
+games.to_parquet(NRFIFeatures.GAMES_PATH, index=False)
 
-#save to csv for faster loading
-df2.to_csv(r'data/nrfi.csv', index_label='Tm')
\ No newline at end of file
+# fold the new games into the saved NRFI totals, rebuilding if they drifted from a replay
+state, new_games = NRFIState.refresh_state(NRFIState.load_state(), games)
+problems = NRFIState.check_state(state, games)
+if problems:
+    print(f"NRFI state inconsistent ({'; '.join(problems)}), rebuilding")
+    state = NRFIState.rebuild_state(games)
+NRFIState.save_state(state)
+print(f"Saved {len(games)} games ({new_games} new)")
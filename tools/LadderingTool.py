@@ -3,34 +3,18 @@ from scipy.stats import lognorm
 import numpy as np
 import pandas as pd
 
+from . import Odds
+
 def app():
     st.title("🪜 Laddering Tool")
     st.markdown("Build and visualize progressive betting ladders to optimize risk and reward.")
 
-    def calculate_american_odds(probability):
-        if probability > 0.5:  # Implies favorite
-            odds = -(probability / (1 - probability)) * 100
-        else:  # Implies underdog
-            odds = ((1 - probability) / probability) * 100
-        return int(round(odds,0))
-
-    # Complementary CDF (1 - CDF) for P(X ≥ k)
+    # Complementary CDF (1 - CDF) for P(X ≥ k), priced as American odds for every k at once
     def prob_gte_k_lognorm(k, mu, sigma):
-        return calculate_american_odds(1 - lognorm.cdf(k, sigma, scale=np.exp(mu)))
+        return Odds.prob_to_american(1 - lognorm.cdf(k, sigma, scale=np.exp(mu)))
 
-    def calculate_winnings(odds_dict, wagers):
-        winnings_dict = {}
-        keys_ = list(odds_dict.keys())
-        odds_ = list(odds_dict.values())
-        for i in range(len(odds_dict)):
-            key = keys_[i]
-            odds = odds_[i]
-            if odds > 0:
-                winnings = wagers[i] * (odds / 100)
-            else:
-                winnings = wagers[i] * (100 / abs(odds))
-            winnings_dict[key] = round(winnings, 2)
-        return winnings_dict
+    def calculate_winnings(odds, wagers):
+        return np.round(Odds.payout(wagers, odds), 2)
 
     def get_wager_ladder(num_bets, starting_bets=[10, 7.5, 5]):
         values = starting_bets.copy()
@@ -70,22 +54,22 @@ def app():
     mu = np.log(stat_per_game)
 
     # Calculate odds and winnings
-    results = {k: prob_gte_k_lognorm(k, mu, 0.5) for k in intervals}
-    winnings = calculate_winnings(results, wagers) if len(wagers) == len(intervals) else {}
+    results = prob_gte_k_lognorm(np.array(intervals), mu, 0.5)
+    winnings = calculate_winnings(results, np.array(wagers)) if len(wagers) == len(intervals) else np.array([])
 
     # Display results
     st.subheader("Ladder Results")
     df = pd.DataFrame({
         "Interval (Stat ≥)": intervals,
-        "American Odds": [results[k] for k in intervals],
+        "American Odds": pd.array(results, dtype="Int64"),
         "Bet Size": wagers if len(wagers) == len(intervals) else [""]*len(intervals),
-        "Potential Winnings": [winnings.get(k, "") for k in intervals]
+        "Potential Winnings": winnings if len(winnings) else [""]*len(intervals)
     })
     st.dataframe(df, use_container_width=True)
 
     if len(wagers) == len(intervals):
         st.markdown(f"**Total Bet:** ${sum(wagers):.2f}")
-        st.markdown(f"**Total Potential Winnings:** ${sum([w for w in winnings.values()]):.2f}")
+        st.markdown(f"**Total Potential Winnings:** ${np.nansum(winnings):.2f}")
 
     st.markdown('Disclaimer: The odds shown are the **assumed** odds, not the actual odds that are being offered by sportsbooks.')
     st.markdown('Nerd Note: For the laddering model, I use a log-normal distribution with a sigma value of 0.5.')
\ No newline at end of file
@@ -0,0 +1,206 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from . import Odds
+from . import NBAElo
+from . import NBALedger
+from . import NBAProfiles
+from . import NBAInsights
+
+##################################################
+# As-of NBA team profiles and insight backtest
+# Days x teams cumulative sums of every home/away split, so a team's profile
+# as it stood before any date is a row lookup. Combined with the team-game
+# ledger for last-N form, every past slate gets its pre-game profiles (and
+# insights) in one vectorized pass.
+##################################################
+
+# insight backtest, computed nightly by nba-collect-data.py for the daily page
+BACKTEST_PATH = r'data/nba_insight_backtest.csv'
+
+# per-side sums behind NBAProfiles.SIDE_METRICS
+SUM_METRICS = ['Games', 'Wins', '1H', '2H', 'PPG', '1H Diff', '2H Diff']
+
+# half picks are graded like a flat bet at a standard price; game picks at
+# the picked team's pre-game Elo moneyline, which follows the matchup
+MARKET_ODDS = -110
+
+def build_asof(scores):
+    """
+    Parameters
+    - scores: season scores with a Date column (NBAScores layout)
+    Returns
+    - dict with the sorted dates, team ids, per-side cumulative sums
+      ((n_dates + 1) x n_teams, row k = games before dates[k]) and the ledger
+      prefix sums flattened across teams
+    """
+    played = scores.dropna(subset=['Home ID', 'Away ID'])
+    games = NBALedger.team_game_rows(NBAProfiles.derive_columns(played.copy()))
+    games['Date'] = np.repeat(played['Date'].to_numpy(), 2)
+    games['Games'] = 1
+    games['Wins'] = games['Win']
+
+    dates = np.unique(games['Date'].to_numpy().astype(str))
+    teams = np.unique(games['Team'].to_numpy())
+    day = np.searchsorted(dates, games['Date'].to_numpy().astype(str))
+    team = np.searchsorted(teams, games['Team'].to_numpy())
+
+    cum = {}
+    for side in ['Home', 'Away']:
+        mask = (games['Side'] == side).to_numpy()
+        for metric in SUM_METRICS:
+            daily = np.zeros((len(dates) + 1, len(teams)))
+            np.add.at(daily, (day[mask] + 1, team[mask]), games[metric].to_numpy(dtype=float)[mask])
+            cum[f'{side} {metric}'] = np.cumsum(daily, axis=0)
+
+    # last-N form: per-team ledger prefix sums laid end to end
+    ledger = NBALedger.build_ledger(scores)
+    lengths = np.array([len(ledger['teams'][int(t)]['Wins']) for t in teams])
+    flat = {m: np.concatenate([ledger['teams'][int(t)][m] for t in teams]) for m in NBALedger.LEDGER_METRICS}
+
+    return {
+        'dates': dates,
+        'teams': teams,
+        'cum': cum,
+        'flat': flat,
+        'offsets': np.concatenate([[0], np.cumsum(lengths)[:-1]]),
+    }
+
+def profiles_asof(asof, team_ids, dates, side):
+    """
+    Profiles of teams as they stood before the given dates, for one side of
+    a slate (the same columns as NBAProfiles.lookup).
+
+    Parameters
+    - team_ids: integer team ids
+    - dates: ISO dates (YYYY-MM-DD), one per team id
+    - side: 'Home' or 'Away'
+    Returns
+    - DataFrame with '<side> <metric>' for SIDE_METRICS and FORM_METRICS, and
+      '<side> Played' (games on either side); NaN where a team had no games
+      of that kind yet
+    """
+    team_ids = np.asarray(team_ids, dtype=int)
+    k = np.searchsorted(asof['dates'], np.asarray(dates, dtype=str), side='left')
+    t = np.searchsorted(asof['teams'], team_ids)
+    t = np.minimum(t, len(asof['teams']) - 1)
+    known = asof['teams'][t] == team_ids
+
+    def before(key):
+        return np.where(known, asof['cum'][key][k, t], np.nan)
+
+    out = {}
+    with np.errstate(invalid='ignore', divide='ignore'):
+        side_games = before(f'{side} Games')
+        out[f'{side} Wins'] = before(f'{side} Wins')
+        out[f'{side} Losses'] = side_games - out[f'{side} Wins']
+        for metric in ['1H', '2H', 'PPG', '1H Diff', '2H Diff']:
+            out[f'{side} {metric}'] = np.round(before(f'{side} {metric}') / side_games, 0)
+
+        # games played before the date on either side, then the ledger window ending there
+        played = before('Home Games') + before('Away Games')
+        played_int = np.nan_to_num(played).astype(np.int64)
+        for n in NBALedger.FORM_WINDOWS:
+            end = asof['offsets'][t] + played_int
+            start = asof['offsets'][t] + np.maximum(played_int - n, 0)
+            window = {m: asof['flat'][m][end] - asof['flat'][m][start] for m in NBALedger.LEDGER_METRICS}
+            n_games = np.where(known, end - start, np.nan)
+            out[f'{side} Last{n}'] = np.where(known, window['Wins'], np.nan)
+            out[f'{side} Last{n} PPG'] = np.round(window['Points'] / n_games, 1)
+            out[f'{side} Last{n} Diff'] = np.round((window['Points'] - window['Allowed']) / n_games, 1)
+
+    out[f'{side} Played'] = played
+    cols = [f'{side} {col}' for col in NBAProfiles.SIDE_METRICS + NBAProfiles.FORM_METRICS + ['Played']]
+    return pd.DataFrame(out)[cols]
+
+def profile_asof(asof, team_id, date):
+    """
+    One team's profile (both sides) before a date, as a dict.
+    """
+    home = profiles_asof(asof, [team_id], [date], 'Home').iloc[0]
+    away = profiles_asof(asof, [team_id], [date], 'Away').iloc[0]
+    return {**home.to_dict(), **away.to_dict()}
+
+def historical_slates(scores, asof=None):
+    """
+    Every played game with both teams' pre-game profiles, laid out like the
+    daily scoreboard, plus the final and half scores used to grade picks and
+    the pre-game Elo home win probability used to price game picks.
+    """
+    asof = asof if asof is not None else build_asof(scores)
+    played = scores.dropna(subset=['Home ID', 'Away ID']).reset_index(drop=True)
+    slates = played[['Date', 'Event ID', 'Home Team', 'Away Team']].copy() if 'Event ID' in played.columns \
+        else played[['Date', 'Home Team', 'Away Team']].copy()
+    for side in ['Home', 'Away']:
+        slates = pd.concat([slates, profiles_asof(asof, played[f'{side} ID'], played['Date'], side)], axis=1)
+    results = {
+        'Game': (played['Home Score'], played['Away Score']),
+        '1H': (played['Home Q1'] + played['Home Q2'], played['Away Q1'] + played['Away Q2']),
+        '2H': (played['Home Q3'] + played['Home Q4'], played['Away Q3'] + played['Away Q4']),
+    }
+    for market, (home, away) in results.items():
+        # home margin in each market; the away team's is its negative
+        slates[f'{market} Margin'] = (home - away).to_numpy()
+    slates['Elo Home Prob'] = NBAElo.pregame_probs(played)
+    return slates
+
+def backtest(slates, rules=NBAInsights.RULES, odds=MARKET_ODDS, min_games=10):
+    """
+    Grade every rule's pick on every past slate: a rule backs (sign +1) or
+    fades (sign -1) its side in its market, settled like a flat 1-unit bet.
+    Game picks are priced at the picked team's pre-game Elo moneyline (so
+    backing a .700 team pays like a favorite), half picks at odds.
+
+    Parameters
+    - slates: historical_slates output
+    - min_games: skip games where either team had played fewer games before
+    Returns
+    - DataFrame with one row per rule: Rule, Side, Market, Bets, Wins,
+      Pushes, HitRate, Price, Profit, ROI
+    """
+    metrics = NBAInsights.slate_metrics(slates)
+    eligible = ((slates['Home Played'] >= min_games) & (slates['Away Played'] >= min_games)).to_numpy()
+    elo_home = slates['Elo Home Prob'].to_numpy(dtype=float)
+
+    rows = []
+    for r, fired in zip(rules, NBAInsights.rule_masks(metrics, rules)):
+        mask = fired & eligible
+        picks_home = (r['side'] == 'Home') == (r['sign'] == 1)
+        margin = slates[f"{r['market']} Margin"].to_numpy()[mask] * (1 if picks_home else -1)
+        won, pushed = margin > 0, margin == 0
+        if r['market'] == 'Game':
+            price = Odds.prob_to_american(elo_home[mask] if picks_home else 1 - elo_home[mask])
+        else:
+            price = np.full(len(margin), float(odds))
+        bets = int(mask.sum())
+        wins, pushes = int(won.sum()), int(pushed.sum())
+        profit = float(Odds.payout(1, price[won]).sum() - (bets - wins - pushes))
+        rows.append({
+            'Rule': f"{r['metric']} {r['comparator']} {r['threshold']}",
+            'Side': r['side'],
+            'Market': r['market'],
+            'Bets': bets,
+            'Wins': wins,
+            'Pushes': pushes,
+            'HitRate': wins / (bets - pushes) if bets > pushes else np.nan,
+            'Price': 'Elo ML' if r['market'] == 'Game' else Odds.format_american(odds),
+            'Profit': profit,
+            'ROI': profit / bets if bets else np.nan,
+        })
+    return pd.DataFrame(rows)
+
+def load_backtest(path=BACKTEST_PATH):
+    """
+    Returns
+    - the saved backtest table (one row per rule), or None if missing
+    """
+    if not os.path.exists(path):
+        return None
+    return pd.read_csv(path)
+
+def save_backtest(results, path=BACKTEST_PATH):
+    tmp_path = path + '.tmp'
+    results.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, path)
@@ -1,11 +1,13 @@
 import streamlit as st
-import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-import requests
-import json
-import datetime
-from datetime import datetime, timedelta
+from datetime import datetime
+
+from . import ESPNScoreboard
+from . import NBAScores
+from . import NBAProfiles
+from . import NBAInsights
+from . import NBAAsOf
+from . import NBAElo
 
 def app():
     st.title("🏀 NBA Daily Insights")
@@ -13,7 +15,7 @@ def app():
 
     st.markdown("Data: NBA Games from the current season")
 
-    df = pd.read_csv(r'data/nba_scores_2025_2026.csv')
+    df = pd.read_csv(NBAScores.SCORES_PATH)
 
     ##### Import appenddata fx
     def appendData(team, today=False):
@@ -45,176 +47,30 @@ def app():
             # If team is missing score for a postponed game, return blank dataframe
             except: return [None,None,None,None,None,None,None,None]
 
-    ### 1. Add core derived column
-    # --- Half totals ---
-    df["Home 1H"] = df["Home Q1"] + df["Home Q2"]
-    df["Home 2H"] = df["Home Q3"] + df["Home Q4"]
-
-    df["Away 1H"] = df["Away Q1"] + df["Away Q2"]
-    df["Away 2H"] = df["Away Q3"] + df["Away Q4"]
-
-    # --- Game totals ---
-    df["Game Total"] = df["Home Score"] + df["Away Score"]
-
-    # --- Half winners ---
-    df["1H Winner"] = df.apply(
-        lambda x: x["Home Team"] if x["Home 1H"] > x["Away 1H"] else x["Away Team"],
-        axis=1
-    )
-
-    df["2H Winner"] = df.apply(
-        lambda x: x["Home Team"] if x["Home 2H"] > x["Away 2H"] else x["Away Team"],
-        axis=1
-    )
-
-    # --- Point differentials ---
-    df["1H Diff"] = df["Home 1H"] - df["Away 1H"]
-    df["2H Diff"] = df["Home 2H"] - df["Away 2H"]
-
-    # --- Win/Loss ---
-    df["Home Win"] = df["Home Score"] > df["Away Score"]
-    df["Away Win"] = df["Away Score"] > df["Home Score"]
-
-    df["Winner"] = df.apply(
-        lambda x: x["Home Team"] if x["Home Win"] else x["Away Team"],
-        axis=1
-    )
-    df["Loser"] = df.apply(
-        lambda x: x["Away Team"] if x["Home Win"] else x["Home Team"],
-        axis=1
-    )
-
-    ### 2. Home/Away records per team
-    home_record = df.groupby("Home ID")["Home Win"].agg(["sum", "count"])
-    home_record.rename(columns={"sum": "Home Wins", "count": "Home Games"}, inplace=True)
-    home_record["Home Losses"] = home_record["Home Games"] - home_record["Home Wins"]
-    del home_record["Home Games"]
-    home_record['Home ID'] = home_record.index.astype(float)
-    home_record.index.name = None
-
-    away_record = df.groupby("Away ID")["Away Win"].agg(["sum", "count"])
-    away_record.rename(columns={"sum": "Away Wins", "count": "Away Games"}, inplace=True)
-    away_record["Away Losses"] = away_record["Away Games"] - away_record["Away Wins"]
-    del away_record["Away Games"]
-    away_record['Away ID'] = away_record.index.astype(float)
-    away_record.index.name = None
-
-    ### 3. Win/loss last 5 and last 10
-    # Build long-form team-game table
-    home_df = df[["Home ID", "Home Win"]].rename(columns={"Home ID": "Team", "Home Win": "Win"})
-    away_df = df[["Away ID", "Away Win"]].rename(columns={"Away ID": "Team", "Away Win": "Win"})
-    team_games = pd.concat([home_df, away_df], ignore_index=True)
-    team_games["Last5"] = team_games.groupby("Team")["Win"].rolling(5).sum().reset_index(0, drop=True)
-    team_games["Last10"] = team_games.groupby("Team")["Win"].rolling(10).sum().reset_index(0, drop=True)
-    team_games_latest = team_games.groupby('Team').tail(1)
-    team_games_latest['Team'] = team_games_latest['Team'].astype(float)
-    # team_games_latest['Home ID'] = team_games_latest['Team']
-    # team_games_latest['Away ID'] = team_games_latest['Team']
-    del team_games_latest["Win"]
-    team_games_latest = team_games_latest.reset_index(drop=True)
-
-    ### 4. Home/away game totals, half totals, PPG
-    #Home
-    home_totals = df.groupby("Home ID")[["Home 1H", "Home 2H", "Home Score"]].mean().round(0) \
-        .rename(columns={"Home Score": "Home PPG"})
-    home_totals['Home ID'] = home_totals.index.astype(float)
-    home_totals.index.name = None
-    #Away
-    away_totals = df.groupby("Away ID")[["Away 1H", "Away 2H", "Away Score"]].mean().round(0) \
-        .rename(columns={"Away Score": "Away PPG"})
-    away_totals['Away ID'] = away_totals.index.astype(float)
-    away_totals.index.name = None
-    
-    ### 5. 1H/2H point differentials
-    # HOME First half
-    home_1h = df.groupby("Home ID")["1H Diff"].mean().round(0).rename("Home 1H Diff")
-    home_1h = pd.DataFrame(home_1h)
-    home_1h['Home ID'] = home_1h.index.astype(float)
-    home_1h.index.name = None
-    # AWAY First half
-    away_1h = df.groupby("Away ID")["1H Diff"].apply(lambda x: -x.mean()).round(0) \
-        .rename("Away 1H Diff")  # invert because diff is Home - Away
-    away_1h = pd.DataFrame(away_1h)
-    away_1h['Away ID'] = away_1h.index.astype(float)
-    away_1h.index.name = None
-
-    #first_half_diff = home_1h.add(away_1h, fill_value=0)
-
-    # Second half
-    # HOME
-    home_2h = df.groupby("Home ID")["2H Diff"].mean().round(0).rename("Home 2H Diff")
-    home_2h = pd.DataFrame(home_2h)
-    home_2h['Home ID'] = home_2h.index.astype(float)
-    home_2h.index.name = None
-    # AWAY
-    away_2h = df.groupby("Away ID")["2H Diff"].apply(lambda x: -x.mean()).round(0) \
-            .rename("Away 2H Diff")
-    away_2h = pd.DataFrame(away_2h)
-    away_2h['Away ID'] = away_2h.index.astype(float)
-    away_2h.index.name = None
-
-    #second_half_diff = home_2h.add(away_2h, fill_value=0)
+    ### 1. Team profiles: every home/away split and form column per team id,
+    # materialized by nba-collect-data.py; rebuilt here if it is missing or behind the scores
+    profiles = NBAProfiles.load_profiles()
+    if not NBAProfiles.check_profiles(profiles, df):
+        profiles = NBAProfiles.build_profiles(df)
 
     #######################
     # Today's scores
     #######################
     #Merge all stats into today's games
     def fetch_team_stats(team_df, type):
-        team_df[f"{type} ID"] = team_df[f"{type} ID"].astype(float)
-        # 1. Home/Away Record
-        if type == "Home":
-            #st.dataframe(team_df)
-            #st.dataframe(home_record)
-            team_df = team_df.merge(home_record, on=f"{type} ID", how="left")
-        else:
-            team_df = team_df.merge(away_record, on=f"{type} ID", how="left")
-
-        # 2. Rolling record
-        #st.dataframe(team_df)
-        #st.dataframe(team_games_latest)
-        if type == "Home":
-            #st.dataframe(team_df)
-            #st.dataframe(home_record)
-            team_df = team_df.merge(team_games_latest, left_on=f"{type} ID", right_on="Team", how="left") \
-                .rename(columns={"Last5": f"{type} Last5", "Last10": f"{type} Last10"})
-        else:
-            team_df = team_df.merge(team_games_latest, left_on=f"{type} ID", right_on="Team", how="left") \
-                .rename(columns={"Last5": f"{type} Last5", "Last10": f"{type} Last10"})
-        
-        # 3. Game/half totals
-        if type == "Home":
-            #st.dataframe(team_df)
-            #st.dataframe(home_totals)
-            team_df = team_df.merge(home_totals, on=f"{type} ID", how="left")
-        else:
-            team_df = team_df.merge(away_totals, on=f"{type} ID", how="left")
-
-        # 4. Half differentials
-        if type == "Home":
-            #st.dataframe(team_df)
-            #st.dataframe(home_1h)
-            team_df = team_df.merge(home_1h, on=f"{type} ID", how="left")
-            team_df = team_df.merge(home_2h, on=f"{type} ID", how="left")
-        else:
-            team_df = team_df.merge(away_1h, on=f"{type} ID", how="left")
-            team_df = team_df.merge(away_2h, on=f"{type} ID", how="left")
-
-        return team_df
+        team_df[f"{type} ID"] = team_df[f"{type} ID"].astype(int)
+        return pd.concat([team_df, NBAProfiles.lookup(profiles, team_df[f"{type} ID"], type)], axis=1)
 
     #####################################
     ##### Get today's games
     #####################################
     def get_today_games(date):
-        # Fetch NBA scoreboard data for a specific date
-        url = f"https://site.api.espn.com/apis/site/v2/sports/basketball/nba/scoreboard?dates={date}"
+        # Fetch NBA scoreboard data for a specific date (read through the response cache,
+        # so reruns within a few minutes reuse the same response)
+        data = ESPNScoreboard.fetch_scoreboards('nba', [date])[0]
+        if data is None:
+            return
         try:
-            # Call requests
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()  # Raise error for bad status codes
-            data = response.json()
-            # Save JSON
-            with open('nba_scoreboard.json', 'w') as f:
-                json.dump(data, f, indent=2)
 
             #Find games
             games = data.get("events", [])
@@ -244,7 +100,6 @@ def app():
                 'Home Team', 'Home Abbreviation', 'Home ID'
             ])
             home_stats = fetch_team_stats(home_teams_local_df, type="Home")
-            del home_stats["Team"] 
             #st.dataframe(home_stats)
 
             #Get team stats for away team
@@ -252,14 +107,13 @@ def app():
                 'Away Team', 'Away Abbreviation', 'Away ID'
             ])
             away_stats = fetch_team_stats(away_teams_local_df, type="Away")
-            del away_stats["Team"]
             #st.dataframe(away_stats)
 
             #Append data
             return pd.concat([home_stats, away_stats], axis=1)
 
-        except requests.RequestException as e:
-            print(f"Error fetching data: {e}")
+        except (KeyError, IndexError, TypeError) as e:
+            print(f"Error parsing data: {e}")
 
     ###########################
     # Get daily scoreboard
@@ -286,28 +140,22 @@ def app():
     scoreboard["Away Last5"] = (scoreboard["Away Last5"]).astype(int)
     scoreboard["Away Last10"] = (scoreboard["Away Last10"]).astype(int)
 
+    ###### Elo ratings (saved nightly; games played since then are folded in here)
+    elo = NBAElo.update_elo(NBAElo.load_elo(), df)
+    scoreboard = pd.concat([scoreboard.reset_index(drop=True),
+                            NBAElo.matchup(elo, scoreboard['Home ID'], scoreboard['Away ID'])], axis=1)
+
     ###### Consolidate scoreboard
     scoreboard = scoreboard[['Home Team', 'Home Wins', 'Home Losses', 'Home PPG',
        'Home Last5', 'Home Last10', 'Home 1H', 'Home 2H', 'Home 1H Diff', 'Home 2H Diff', 
        'Away Team','Away Wins', 'Away Losses', 'Away PPG', 
-       'Away Last5', 'Away Last10', 'Away 1H', 'Away 2H',  'Away 1H Diff', 'Away 2H Diff']]
+       'Away Last5', 'Away Last10', 'Away 1H', 'Away 2H',  'Away 1H Diff', 'Away 2H Diff',
+       'Home Elo', 'Away Elo', 'Elo Home Win %', 'Elo Home ML', 'Elo Away ML', 'Elo Spread']]
     #st.dataframe(scoreboard)
 
     #############################
     #### KEY INSIGHTS
     #############################
-    #Betting odds function
-    def pct_to_american(p):
-        """
-        Convert win probability (0–1) to American odds.
-        Example: 0.20 -> +400
-        """
-        # Underdog
-        if p < 0.5:
-            return f"+{int((100 * (1 - p) / p))}"
-        # Favorite
-        return int((-100 * p / (1 - p)))
-    
     # Game selection filter
     #st.markdown("---")
     st.subheader(f"📊 NBA Scoreboard for {datetime.now().strftime('%B %d, %Y')}")
@@ -331,86 +179,19 @@ def app():
     # st.subheader("🏀 Scoreboard")
     st.dataframe(filtered_scoreboard, use_container_width=True)
     
-    # Generate key insights for a user
-    # Each row is a game
-    def generate_insights(game):
-        # Print game
-        st.write(f"##### {game['Away Team']} @ {game['Home Team']}")    
-
-        #Record
-        ##home
-        home_win_pct = game["Home Wins"] / (game["Home Wins"] + game["Home Losses"])
-        if home_win_pct >= 0.6:
-            st.write(f"{game['Home Team']} have an implied home moneyline of {pct_to_american(home_win_pct)} based on home record")
-        elif home_win_pct <= 0.35:
-            st.write(f"{game['Home Team']} have an implied home moneyline of {pct_to_american(home_win_pct)} based on home record")
-        
-        ##away record
-        away_win_pct = game["Away Wins"] / (game["Away Wins"] + game["Away Losses"])
-        if away_win_pct >= 0.6:
-            st.write(f"{game['Away Team']} have an implied away moneyline of {pct_to_american(away_win_pct)} based on away record")
-        elif away_win_pct <= 0.35:
-            st.write(f"{game['Away Team']} have an implied away moneyline of {pct_to_american(away_win_pct)} based on away record")
-
-        # PPG
-        if game['Home PPG'] - game['Away PPG'] >= 10:
-            st.write(f"{game['Home Team']} have a significant scoring advantage of {game['Home PPG'] - game['Away PPG']} points.")
-        elif game['Away PPG'] - game['Home PPG'] >= 10:
-            st.write(f"{game['Away Team']} have a significant scoring advantage of {game['Away PPG'] - game['Home PPG']} points.")
-        
-        #### Last X games
-        # 4+ / 5 = good
-        # 7+ / 10 = good
-        if game["Home Last10"] > 6:
-            st.write(f"{game['Home Team']} have won {game['Home Last10']} of their last 10 games.")
-        elif game["Home Last5"] > 3:
-            st.write(f"{game['Home Team']} have won {game['Home Last5']} of their last 5 games.")
-        if game["Away Last10"] > 6:
-            st.write(f"{game['Away Team']} have won {game['Away Last10']} of their last 10 games.")
-        elif game["Away Last5"] > 3:
-            st.write(f"{game['Away Team']} have won {game['Away Last5']} of their last 5 games.")
-
-        # 0 or 1 games / 5 = bad
-        # 0-2 games / 10 = bad
-        if game["Home Last10"] <= 2:
-            st.write(f"{game['Home Team']} have won only {game['Home Last10']} of their last 10 games.")
-        elif game["Home Last5"] <= 1:
-            st.write(f"{game['Home Team']} have won only {game['Home Last5']} of their last 5 games.")
-        if game["Away Last10"] <= 2:
-            st.write(f"{game['Away Team']} have won only {game['Away Last10']} of their last 10 games.")
-        elif game["Away Last5"] <= 1:
-            st.write(f"{game['Away Team']} have won only {game['Away Last5']} of their last 5 games.")
-
-        #Half Diffs
-        if game["Home 1H Diff"] >= 5:
-            st.write(f"{game['Home Team']} have a strong first half differential of {game['Home 1H Diff']} points.")
-        elif game["Home 1H Diff"] <= -5:
-            st.write(f"{game['Home Team']} have a weak first half differential of {game['Home 1H Diff']} points.")
-        if game["Away 1H Diff"] >= 5:
-            st.write(f"{game['Away Team']} have a strong first half differential of {game['Away 1H Diff']} points.")
-        elif game["Away 1H Diff"] <= -5:
-            st.write(f"{game['Away Team']} have a weak first half differential of {game['Away 1H Diff']} points.")
-        if game["Home 2H Diff"] >= 5:
-            st.write(f"{game['Home Team']} have a strong second half differential of {game['Home 2H Diff']} points.")
-        elif game["Home 2H Diff"] <= -5:
-            st.write(f"{game['Home Team']} have a weak second half differential of {game['Home 2H Diff']} points.")
-        if game["Away 2H Diff"] >= 5:
-            st.write(f"{game['Away Team']} have a strong second half differential of {game['Away 2H Diff']} points.")
-        elif game["Away 2H Diff"] <= -5:
-            st.write(f"{game['Away Team']} have a weak second half differential of {game['Away 2H Diff']} points.")
-        
-        #Half Totals
-        if game["Home 1H"] - game["Away 1H"] >= 5:
-            st.write(f"{game['Home Team']} have a strong first half scoring advantage of {game['Home 1H'] - game['Away 1H']} points.")
-        elif game["Away 1H"] - game["Home 1H"] >= 5:
-            st.write(f"{game['Away Team']} have a strong first half scoring advantage of {game['Away 1H'] - game['Home 1H']} points.")
-        if game["Home 2H"] - game["Away 2H"] >= 5:
-            st.write(f"{game['Home Team']} have a strong second half scoring advantage of {game['Home 2H'] - game['Away 2H']} points.")
-        elif game["Away 2H"] - game["Home 2H"] >= 5:
-            st.write(f"{game['Away Team']} have a strong second half scoring advantage of {game['Away 2H'] - game['Home 2H']} points.")
-
-    # Print insights per game
+    # Key insights for a user: the rules in NBAInsights evaluated over the
+    # whole slate at once, one markdown block per game
     st.subheader("💡 Game Insights")
-    for _, game in filtered_scoreboard.iterrows():
-        generate_insights(game)
+    for block in NBAInsights.insight_blocks(filtered_scoreboard):
+        st.markdown(block)
+
+    # How the insights did on every past slate, using the profiles as they stood before each game
+    # (computed nightly by nba-collect-data.py)
+    backtest = NBAAsOf.load_backtest()
+    if backtest is not None:
+        with st.expander("Insight backtest (season to date)"):
+            st.caption(f"Each insight backs or fades its team in the game or half it describes, graded as a "
+                       f"flat 1-unit bet: game picks at the picked team's pre-game Elo moneyline, half picks at "
+                       f"{NBAAsOf.MARKET_ODDS}. Games where either team had played fewer than 10 games are skipped.")
+            st.dataframe(backtest, hide_index=True)
     st.markdown("---")
\ No newline at end of file
@@ -0,0 +1,157 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from . import Odds
+
+##################################################
+# NBA Elo ratings
+# One rating per team id, updated game by game from the season scores with a
+# margin-of-victory multiplier. Saved with the event ids already counted, so
+# the nightly update only folds in new games.
+##################################################
+
+ELO_PATH = r'data/nba_elo.json'
+
+BASE_RATING = 1500
+K = 20
+HOME_ADVANTAGE = 100   # Elo points
+ELO_PER_POINT = 28     # Elo points per point of spread
+
+def empty_elo():
+    return {
+        'ratings': {},   # team id -> rating
+        'games': {},     # team id -> games rated
+        'seen': set(),   # event ids already counted
+    }
+
+def expected(diff):
+    """
+    Win probability of the side rated diff Elo points higher (home advantage included).
+    """
+    return 1 / (1 + 10 ** (-np.asarray(diff, dtype=float) / 400))
+
+def mov_multiplier(margin, winner_diff):
+    # bigger wins move ratings more, less so when the favorite won (autocorrelation correction)
+    return (abs(margin) + 3) ** 0.8 / (7.5 + 0.006 * winner_diff)
+
+def rating(elo, team):
+    return elo['ratings'].get(int(team), BASE_RATING)
+
+def add_game(elo, home, away, home_score, away_score):
+    """
+    Update both teams' ratings with one final score, in place.
+
+    Returns
+    - the home team's pre-game win probability
+    """
+    home, away = int(home), int(away)
+    diff = rating(elo, home) + HOME_ADVANTAGE - rating(elo, away)
+    p_home = float(expected(diff))
+    margin = home_score - away_score
+    result = 1.0 if margin > 0 else 0.0 if margin < 0 else 0.5
+    winner_diff = diff if margin > 0 else -diff
+    shift = K * mov_multiplier(margin, winner_diff) * (result - p_home)
+
+    elo['ratings'][home] = rating(elo, home) + shift
+    elo['ratings'][away] = rating(elo, away) - shift
+    for team in (home, away):
+        elo['games'][team] = elo['games'].get(team, 0) + 1
+    return p_home
+
+def update_elo(elo, scores):
+    """
+    Fold every game of scores not counted yet into the ratings, in date order.
+    Scores without an Event ID column (older files) are rated from scratch.
+
+    Returns
+    - elo
+    """
+    if elo is None or 'Event ID' not in scores.columns:
+        elo = empty_elo()
+    played = scores.dropna(subset=['Home ID', 'Away ID', 'Home Score', 'Away Score'])
+    if 'Date' in played.columns:
+        played = played.sort_values('Date', kind='stable')
+    if 'Event ID' in played.columns:
+        played = played[~played['Event ID'].isin(elo['seen'])]
+        elo['seen'].update(int(e) for e in played['Event ID'])
+    for home, away, home_score, away_score in zip(played['Home ID'], played['Away ID'],
+                                                  played['Home Score'], played['Away Score']):
+        add_game(elo, home, away, int(home_score), int(away_score))
+    return elo
+
+def pregame_probs(scores):
+    """
+    Every game's home win probability from the ratings as they stood before
+    it, rating the season from scratch in date order.
+
+    Returns
+    - array aligned with the rows of scores, NaN for games without a final
+    """
+    elo = empty_elo()
+    probs = np.full(len(scores), np.nan)
+    played = scores.reset_index(drop=True).dropna(subset=['Home ID', 'Away ID', 'Home Score', 'Away Score'])
+    if 'Date' in played.columns:
+        played = played.sort_values('Date', kind='stable')
+    for i, home, away, home_score, away_score in zip(played.index, played['Home ID'], played['Away ID'],
+                                                     played['Home Score'], played['Away Score']):
+        probs[i] = add_game(elo, home, away, int(home_score), int(away_score))
+    return probs
+
+def matchup(elo, home_ids, away_ids):
+    """
+    Price today's games from the current ratings.
+
+    Parameters
+    - home_ids, away_ids: integer team ids, one per game
+    Returns
+    - DataFrame aligned with the games: Home Elo, Away Elo, Elo Home Win %,
+      Elo Home ML, Elo Away ML (American odds) and Elo Spread (home line,
+      negative when the home team is favored, to the half point)
+    """
+    home = np.array([rating(elo, t) for t in home_ids], dtype=float)
+    away = np.array([rating(elo, t) for t in away_ids], dtype=float)
+    diff = home + HOME_ADVANTAGE - away
+    p_home = expected(diff)
+    return pd.DataFrame({
+        'Home Elo': np.round(home),
+        'Away Elo': np.round(away),
+        'Elo Home Win %': np.round(100 * p_home, 1),
+        'Elo Home ML': Odds.format_american(Odds.prob_to_american(p_home)),
+        'Elo Away ML': Odds.format_american(Odds.prob_to_american(1 - p_home)),
+        'Elo Spread': np.round(-diff / ELO_PER_POINT * 2) / 2,
+    })
+
+def elo_to_json(elo):
+    return {
+        'ratings': {str(t): r for t, r in elo['ratings'].items()},
+        'games': {str(t): n for t, n in elo['games'].items()},
+        'seen': sorted(elo['seen']),
+    }
+
+def elo_from_json(data):
+    # JSON keys lose their type; team ids are ints
+    return {
+        'ratings': {int(t): float(r) for t, r in data['ratings'].items()},
+        'games': {int(t): int(n) for t, n in data['games'].items()},
+        'seen': set(int(e) for e in data['seen']),
+    }
+
+def load_elo(path=ELO_PATH):
+    """
+    Returns
+    - the saved ratings, or None if missing or unreadable
+    """
+    try:
+        with open(path) as f:
+            return elo_from_json(json.load(f))
+    except (OSError, ValueError, KeyError):
+        return None
+
+def save_elo(elo, path=ELO_PATH):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(elo_to_json(elo), f)
+    os.replace(tmp_path, path)
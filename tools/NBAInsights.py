@@ -0,0 +1,155 @@
+import operator
+
+import numpy as np
+import pandas as pd
+
+from . import Odds
+
+##################################################
+# NBA Daily insight rules
+# Every insight is a row of data: a metric column, a comparator, a threshold
+# and a sentence template. Rules are evaluated as boolean masks over the whole
+# slate and each game's sentences are joined into one markdown block.
+##################################################
+
+COMPARATORS = {
+    '>': operator.gt,
+    '>=': operator.ge,
+    '<': operator.lt,
+    '<=': operator.le,
+}
+
+def rule(metric, comparator, threshold, template, group=None, sign=1, market='Game'):
+    """
+    Parameters
+    - metric: column of the slate (see slate_metrics) compared to threshold
+    - template: str.format template over the slate's columns, e.g. '{Home Team}'
+    - group: rules sharing a group are exclusive, the first match in rule order wins
+      (an if / elif chain); None for a rule that stands alone
+    - sign / market: the pick the insight implies for backtesting: back (+1)
+      or fade (-1) the rule's side to win the 'Game', '1H' or '2H'
+    Written once with '<side>' / '<venue>' placeholders, a rule is expanded
+    for both teams by sided(), which also sets its side.
+    """
+    return {'metric': metric, 'comparator': comparator, 'threshold': threshold, 'template': template,
+            'group': group, 'sign': sign, 'market': market, 'side': None}
+
+def sided(*rules):
+    """
+    The rules for the home team followed by the same rules for the away team,
+    '<side>' replaced by Home / Away and '<venue>' by home / away.
+    """
+    expanded = []
+    for side in ['Home', 'Away']:
+        for r in rules:
+            expanded.append({key: value.replace('<side>', side).replace('<venue>', side.lower())
+                             if isinstance(value, str) else value for key, value in r.items()})
+            expanded[-1]['side'] = side
+    return expanded
+
+RULES = [
+    # Record
+    *sided(
+        rule('<side> Win Pct', '>=', 0.6,
+             "{<side> Team} have an implied <venue> moneyline of {<side> ML} based on <venue> record", '<side> record'),
+        rule('<side> Win Pct', '<=', 0.35,
+             "{<side> Team} have an implied <venue> moneyline of {<side> ML} based on <venue> record", '<side> record',
+             sign=-1),
+    ),
+    # PPG
+    *sided(
+        rule('<side> PPG Edge', '>=', 10,
+             "{<side> Team} have a significant scoring advantage of {<side> PPG Edge} points.", 'PPG'),
+    ),
+    # Last X games: 7+ / 10 or 4+ / 5 = good
+    *sided(
+        rule('<side> Last10', '>', 6, "{<side> Team} have won {<side> Last10} of their last 10 games.", '<side> hot'),
+        rule('<side> Last5', '>', 3, "{<side> Team} have won {<side> Last5} of their last 5 games.", '<side> hot'),
+    ),
+    # 0-2 games / 10 or 0-1 / 5 = bad
+    *sided(
+        rule('<side> Last10', '<=', 2, "{<side> Team} have won only {<side> Last10} of their last 10 games.", '<side> cold',
+             sign=-1),
+        rule('<side> Last5', '<=', 1, "{<side> Team} have won only {<side> Last5} of their last 5 games.", '<side> cold',
+             sign=-1),
+    ),
+    # Half differentials
+    *sided(
+        rule('<side> 1H Diff', '>=', 5,
+             "{<side> Team} have a strong first half differential of {<side> 1H Diff} points.", '<side> 1H diff',
+             market='1H'),
+        rule('<side> 1H Diff', '<=', -5,
+             "{<side> Team} have a weak first half differential of {<side> 1H Diff} points.", '<side> 1H diff',
+             sign=-1, market='1H'),
+    ),
+    *sided(
+        rule('<side> 2H Diff', '>=', 5,
+             "{<side> Team} have a strong second half differential of {<side> 2H Diff} points.", '<side> 2H diff',
+             market='2H'),
+        rule('<side> 2H Diff', '<=', -5,
+             "{<side> Team} have a weak second half differential of {<side> 2H Diff} points.", '<side> 2H diff',
+             sign=-1, market='2H'),
+    ),
+    # Half totals
+    *sided(
+        rule('<side> 1H Edge', '>=', 5,
+             "{<side> Team} have a strong first half scoring advantage of {<side> 1H Edge} points.", '1H edge',
+             market='1H'),
+    ),
+    *sided(
+        rule('<side> 2H Edge', '>=', 5,
+             "{<side> Team} have a strong second half scoring advantage of {<side> 2H Edge} points.", '2H edge',
+             market='2H'),
+    ),
+]
+
+def slate_metrics(scoreboard):
+    """
+    The scoreboard plus the derived columns the rules compare: win pct and
+    its implied moneyline per side, and PPG / half-total edges from each side.
+    """
+    slate = scoreboard.copy()
+    for side, other in [('Home', 'Away'), ('Away', 'Home')]:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            slate[f'{side} Win Pct'] = slate[f'{side} Wins'] / (slate[f'{side} Wins'] + slate[f'{side} Losses'])
+        slate[f'{side} ML'] = Odds.format_american(Odds.prob_to_american(slate[f'{side} Win Pct']))
+        for col in ['PPG', '1H', '2H']:
+            slate[f'{side} {col} Edge'] = slate[f'{side} {col}'] - slate[f'{other} {col}']
+    return slate
+
+def rule_masks(slate, rules=RULES):
+    """
+    Returns
+    - list (one per rule) of boolean arrays over the slate rows where the rule
+      fires, after earlier rules of its group took their rows
+    """
+    masks = []
+    taken = {}
+    for r in rules:
+        mask = COMPARATORS[r['comparator']](slate[r['metric']].to_numpy(dtype=float), r['threshold'])
+        if r['group'] is not None:
+            blocked = taken.get(r['group'], np.zeros(len(slate), dtype=bool))
+            taken[r['group']] = blocked | mask
+            mask = mask & ~blocked
+        masks.append(mask)
+    return masks
+
+def evaluate(slate, rules=RULES):
+    """
+    Returns
+    - list (one per slate row) of the insight sentences, in rule order
+    """
+    insights = [[] for _ in range(len(slate))]
+    records = slate.to_dict('records')
+    for r, mask in zip(rules, rule_masks(slate, rules)):
+        for i in np.flatnonzero(mask):
+            insights[i].append(r['template'].format(**records[i]))
+    return insights
+
+def insight_blocks(scoreboard, rules=RULES):
+    """
+    One markdown block per game: a heading and its insights.
+    """
+    slate = slate_metrics(scoreboard)
+    headers = "##### " + slate['Away Team'] + " @ " + slate['Home Team']
+    return ["\n\n".join([header] + sentences) for header, sentences in zip(headers, evaluate(slate, rules))]
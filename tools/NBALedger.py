@@ -0,0 +1,163 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+##################################################
+# NBA team-game ledger
+# Every team's games in date order as cumulative win / points / points-allowed
+# arrays, so last-N wins, points and differentials for any N are two prefix
+# lookups. New dates are folded in by extending the arrays.
+##################################################
+
+LEDGER_PATH = r'data/nba_team_ledger.json'
+
+LEDGER_METRICS = ['Wins', 'Points', 'Allowed']
+# team_game_rows column behind each metric
+LEDGER_COLUMNS = {'Wins': 'Win', 'Points': 'PPG', 'Allowed': 'Allowed'}
+FORM_WINDOWS = [3, 5, 10, 20]
+
+def empty_ledger():
+    return {
+        'rows': 0,     # scores rows folded in so far
+        'teams': {},   # team id -> {metric: prefix sums, starting with 0}
+    }
+
+def _ordered(scores):
+    # file order is collection order; a Date column (when present) decides
+    if 'Date' in scores.columns:
+        return scores.sort_values('Date', kind='stable')
+    return scores
+
+def team_game_rows(df):
+    """
+    One row per team per game, home and away interleaved so each team's rows
+    stay chronological: Team, Side, Win, PPG (points scored) and Allowed, plus
+    1H / 2H and the team-side 1H Diff / 2H Diff when df has the half columns
+    of NBAProfiles.derive_columns.
+    """
+    def both(home, away):
+        return np.column_stack([home, away]).ravel()
+
+    home_score = df['Home Score'].to_numpy()
+    away_score = df['Away Score'].to_numpy()
+    rows = pd.DataFrame({
+        'Team': both(df['Home ID'], df['Away ID']).astype(int),
+        'Side': np.tile(['Home', 'Away'], len(df)),
+        'Win': both(home_score > away_score, away_score > home_score),
+        'PPG': both(home_score, away_score),
+        'Allowed': both(away_score, home_score),
+    })
+    if 'Home 1H' in df.columns:
+        for half in ['1H', '2H']:
+            rows[half] = both(df[f'Home {half}'], df[f'Away {half}'])
+            # differentials from the team's side (the game columns are home minus away)
+            rows[f'{half} Diff'] = both(df[f'{half} Diff'], -df[f'{half} Diff'])
+    return rows
+
+def extend(ledger, scores):
+    """
+    Fold the scores rows the ledger has not seen yet into it, in place.
+
+    Each team's arrays are reallocated once per call (np.concatenate), so a
+    call costs O(games so far) per team it touches. The nightly run calls it
+    once with the day's rows, i.e. one copy of ~82 values per team per day,
+    not one per game.
+
+    Parameters
+    - scores: the season scores (NBAScores layout), earlier rows unchanged
+      since the last call
+    Returns
+    - ledger
+    """
+    new_rows = _ordered(scores.iloc[ledger['rows']:])
+    played = new_rows.dropna(subset=['Home ID', 'Away ID', 'Home Score', 'Away Score'])
+    for team, games in team_game_rows(played).groupby('Team', sort=False):
+        sums = ledger['teams'].setdefault(int(team), {m: np.zeros(1, dtype=np.int64) for m in LEDGER_METRICS})
+        for m in LEDGER_METRICS:
+            values = games[LEDGER_COLUMNS[m]].to_numpy(dtype=np.int64)
+            sums[m] = np.concatenate([sums[m], sums[m][-1] + np.cumsum(values)])
+    ledger['rows'] = len(scores)
+    return ledger
+
+def build_ledger(scores):
+    return extend(empty_ledger(), scores)
+
+def games_played(ledger, team):
+    sums = ledger['teams'].get(int(team))
+    return 0 if sums is None else len(sums['Wins']) - 1
+
+def last_n(ledger, team, n):
+    """
+    A team's last n games (fewer early in the season) from prefix sums.
+
+    Returns
+    - dict with Games, Wins, Points, Allowed and Diff (points minus allowed)
+    """
+    sums = ledger['teams'].get(int(team))
+    if sums is None:
+        return {'Games': 0, 'Wins': 0, 'Points': 0, 'Allowed': 0, 'Diff': 0}
+    end = len(sums['Wins']) - 1
+    start = max(end - n, 0)
+    window = {m: int(sums[m][end] - sums[m][start]) for m in LEDGER_METRICS}
+    return {'Games': end - start, **window, 'Diff': window['Points'] - window['Allowed']}
+
+def form_table(ledger, windows=FORM_WINDOWS):
+    """
+    Last-N form of every team.
+
+    Returns
+    - DataFrame indexed by team id with, for each n: 'Last<n>' wins and
+      'Last<n> PPG' / 'Last<n> Diff' per-game averages over the window
+    """
+    teams = sorted(ledger['teams'])
+    form = pd.DataFrame(index=pd.Index(teams, name='Team ID'))
+    for n in windows:
+        last = [last_n(ledger, team, n) for team in teams]
+        games = np.array([g['Games'] for g in last])
+        form[f'Last{n}'] = np.array([g['Wins'] for g in last], dtype=np.int64)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            form[f'Last{n} PPG'] = np.round(np.array([g['Points'] for g in last]) / games, 1)
+            form[f'Last{n} Diff'] = np.round(np.array([g['Diff'] for g in last]) / games, 1)
+    return form
+
+def ledger_to_json(ledger):
+    return {
+        'rows': ledger['rows'],
+        'teams': {str(team): {m: sums[m].tolist() for m in LEDGER_METRICS} for team, sums in ledger['teams'].items()},
+    }
+
+def ledger_from_json(data):
+    return {
+        'rows': data['rows'],
+        # JSON keys lose their type; team ids are ints
+        'teams': {int(team): {m: np.asarray(sums[m], dtype=np.int64) for m in LEDGER_METRICS}
+                  for team, sums in data['teams'].items()},
+    }
+
+def load_ledger(path=LEDGER_PATH):
+    """
+    Returns
+    - the saved ledger, or None if missing or unreadable
+    """
+    try:
+        with open(path) as f:
+            return ledger_from_json(json.load(f))
+    except (OSError, ValueError, KeyError):
+        return None
+
+def save_ledger(ledger, path=LEDGER_PATH):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(ledger_to_json(ledger), f)
+    os.replace(tmp_path, path)
+
+def update_ledger(ledger, scores):
+    """
+    Extend a saved ledger with the new scores rows, or rebuild it when the
+    scores are shorter than what it already holds (a new or refetched season).
+    """
+    if ledger is None or ledger['rows'] > len(scores):
+        return build_ledger(scores)
+    return extend(ledger, scores)
@@ -0,0 +1,132 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from . import NBALedger
+
+##################################################
+# NBA team profiles
+# One row per team id with every home/away split and the form columns, built
+# column-wise from the season scores by nba-collect-data.py so the daily page
+# only looks today's teams up
+##################################################
+
+PROFILE_PATH = r'data/nba_team_profiles.csv'
+
+# per-side metrics, e.g. 'Home Wins' / 'Away Wins'
+SIDE_METRICS = ['Wins', 'Losses', '1H', '2H', 'PPG', '1H Diff', '2H Diff']
+# last-N wins, points per game and differential from the team-game ledger
+FORM_METRICS = [col for n in NBALedger.FORM_WINDOWS for col in (f'Last{n}', f'Last{n} PPG', f'Last{n} Diff')]
+
+def derive_columns(df):
+    """
+    Add half totals, game total, half winners and differentials, and
+    winner/loser columns to a season of scores (one row per game).
+    """
+    home_team = df["Home Team"].to_numpy()
+    away_team = df["Away Team"].to_numpy()
+
+    # --- Half totals ---
+    df["Home 1H"] = df["Home Q1"] + df["Home Q2"]
+    df["Home 2H"] = df["Home Q3"] + df["Home Q4"]
+
+    df["Away 1H"] = df["Away Q1"] + df["Away Q2"]
+    df["Away 2H"] = df["Away Q3"] + df["Away Q4"]
+
+    # --- Game totals ---
+    df["Game Total"] = df["Home Score"] + df["Away Score"]
+
+    # --- Half winners (ties go to the away team) ---
+    df["1H Winner"] = np.where(df["Home 1H"] > df["Away 1H"], home_team, away_team)
+    df["2H Winner"] = np.where(df["Home 2H"] > df["Away 2H"], home_team, away_team)
+
+    # --- Point differentials ---
+    df["1H Diff"] = df["Home 1H"] - df["Away 1H"]
+    df["2H Diff"] = df["Home 2H"] - df["Away 2H"]
+
+    # --- Win/Loss ---
+    df["Home Win"] = df["Home Score"] > df["Away Score"]
+    df["Away Win"] = df["Away Score"] > df["Home Score"]
+
+    df["Winner"] = np.where(df["Home Win"], home_team, away_team)
+    df["Loser"] = np.where(df["Home Win"], away_team, home_team)
+    return df
+
+def _played(scores):
+    # blank rows are games that were postponed when collected
+    return scores.dropna(subset=["Home ID", "Away ID"])
+
+def build_profiles(scores, ledger=None):
+    """
+    Every per-team split from one grouped aggregation over (team, side),
+    joined with the team's recent form.
+
+    Parameters
+    - scores: season scores (NBAScores layout), in game order
+    - ledger: NBALedger built from the same scores (default: built here)
+    Returns
+    - DataFrame indexed by integer team id: 'Home <metric>' / 'Away <metric>'
+      for SIDE_METRICS (means rounded to whole points), plus FORM_METRICS over
+      the team's most recent home or away games
+    """
+    team_games = NBALedger.team_game_rows(derive_columns(_played(scores).copy()))
+    agg = team_games.groupby(["Team", "Side"]).agg(
+        Wins=("Win", "sum"),
+        Games=("Win", "size"),
+        **{col: (col, "mean") for col in ["1H", "2H", "PPG", "1H Diff", "2H Diff"]},
+    )
+    agg["Losses"] = agg["Games"] - agg["Wins"]
+    wide = agg.unstack("Side")
+
+    profiles = pd.DataFrame(index=wide.index)
+    for side in ["Home", "Away"]:
+        for col in SIDE_METRICS:
+            values = wide[(col, side)]
+            profiles[f"{side} {col}"] = values.fillna(0).astype(int) if col in ("Wins", "Losses") else values.round(0)
+    profiles.index.name = 'Team ID'
+
+    ledger = ledger if ledger is not None else NBALedger.build_ledger(scores)
+    return profiles.join(NBALedger.form_table(ledger)[FORM_METRICS])
+
+def load_profiles(path=PROFILE_PATH):
+    """
+    Returns
+    - the saved profile table indexed by integer team id, or None if missing
+    """
+    if not os.path.exists(path):
+        return None
+    profiles = pd.read_csv(path, index_col='Team ID')
+    profiles.index = profiles.index.astype(int)
+    return profiles
+
+def save_profiles(profiles, path=PROFILE_PATH):
+    tmp_path = path + '.tmp'
+    profiles.to_csv(tmp_path)
+    os.replace(tmp_path, path)
+
+def check_profiles(profiles, scores):
+    """
+    True when the table was built from every played game in scores.
+    """
+    required = [f"{side} {col}" for side in ["Home", "Away"] for col in SIDE_METRICS] + FORM_METRICS
+    if profiles is None or not set(required).issubset(profiles.columns):
+        return False
+    decided = profiles[["Home Wins", "Home Losses", "Away Wins", "Away Losses"]].to_numpy().sum()
+    return bool(decided == 2 * len(_played(scores)))
+
+def lookup(profiles, team_ids, side):
+    """
+    One indexed lookup of one side of today's games.
+
+    Parameters
+    - team_ids: integer team ids, one per game
+    - side: 'Home' or 'Away'
+    Returns
+    - the side's metric and form columns (e.g. 'Home Wins', 'Home Last5 PPG'),
+      one row per id in order with a fresh index; NaN for unknown teams
+    """
+    cols = [f"{side} {col}" for col in SIDE_METRICS]
+    stats = profiles[cols + FORM_METRICS].reindex(np.asarray(team_ids, dtype=int))
+    stats = stats.rename(columns={col: f"{side} {col}" for col in FORM_METRICS})
+    return stats.reset_index(drop=True)
@@ -0,0 +1,76 @@
+import os
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from . import ESPNScoreboard
+
+##################################################
+# NBA season scores
+# One dated row per completed game, keyed by ESPN event id. The nightly
+# collector fetches from the last collected date on, upserts by event id and
+# replaces the file atomically.
+##################################################
+
+SCORES_PATH = r'data/nba_scores_2025_2026.csv'
+# dates whose fetch failed, retried on the next run
+FAILED_DATES_PATH = r'data/nba_failed_dates.json'
+SEASON_START = '20251021'
+
+SCORES_KEY = 'Event ID'
+
+def load_scores(path=SCORES_PATH):
+    """
+    Returns
+    - the saved scores, or None when missing or written before the file had
+      Date / Event ID columns (the caller then refetches the season)
+    """
+    if not os.path.exists(path):
+        return None
+    scores = pd.read_csv(path, dtype={'Date': str})
+    if not {'Date', SCORES_KEY}.issubset(scores.columns):
+        return None
+    return scores[ESPNScoreboard.NBA_SCORE_COLUMNS].astype(ESPNScoreboard.NBA_SCORE_DTYPES)
+
+def save_scores(scores, path=SCORES_PATH):
+    tmp_path = path + '.tmp'
+    scores.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+def fetch_dates(scores, today=None):
+    """
+    YYYYMMDD dates to fetch: from the last collected date (refetched for
+    late finishes and corrections) through today, or the whole season when
+    nothing is collected yet.
+    """
+    if scores is None or scores.empty:
+        start = datetime.strptime(SEASON_START, "%Y%m%d")
+    else:
+        start = datetime.strptime(scores['Date'].max(), "%Y-%m-%d")
+    end = today or datetime.now()
+    return [(start + timedelta(days=i)).strftime("%Y%m%d") for i in range((end - start).days + 1)]
+
+def upsert_scores(scores, records):
+    """
+    Replace the rows of games already collected (in place, so earlier rows keep
+    their position) and append new games in date order.
+
+    Returns
+    - updated scores, number of games added, number of games whose row changed
+    """
+    new_rows = ESPNScoreboard.nba_scores_frame(records).drop_duplicates(SCORES_KEY, keep='last')
+    if scores is None:
+        scores = ESPNScoreboard.nba_scores_frame([])
+
+    position = pd.Series(range(len(scores)), index=scores[SCORES_KEY].to_numpy())
+    known = new_rows[SCORES_KEY].isin(position.index).to_numpy()
+    updates = new_rows[known]
+    rows = position.loc[updates[SCORES_KEY]].to_numpy()
+    before = scores.iloc[rows].reset_index(drop=True)
+    corrected = int((before != updates.reset_index(drop=True)).any(axis=1).sum())
+
+    scores = scores.copy()
+    scores.iloc[rows] = updates.to_numpy()
+    added = new_rows[~known]
+    scores = pd.concat([scores, added], ignore_index=True).sort_values('Date', kind='stable')
+    return scores.reset_index(drop=True).astype(ESPNScoreboard.NBA_SCORE_DTYPES), len(added), corrected
@@ -0,0 +1,151 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import sklearn.tree as tree
+
+from . import NRFIFeatures
+from . import NRFIForm
+from . import NRFIModelCache
+from . import Odds
+
+##################################################
+# Walk-forward NRFI backtest
+# For every day D: train on all games before D, score the games on D
+##################################################
+
+def check_pregame_order(games):
+    """
+    Raise ValueError if any game's pre-game features could include a game
+    played on a later date, i.e. the rows the running totals were accumulated
+    over (in their row order) are not in date order.
+    """
+    dates = pd.to_datetime(games['game_date']).reset_index(drop=True)
+    later = dates < dates.cummax()
+    if later.any():
+        first = int(later.to_numpy().argmax())
+        raise ValueError(f"game_pk {int(games['game_pk'].iloc[first])} on {dates[first].date()} was accumulated "
+                         f"after a game played {dates[:first].max().date()}; its features would see the future")
+
+def pregame_features(games):
+    """
+    Season-to-date and form features for every game, accumulated in date order.
+
+    Parameters
+    - games: game table with game_date, teams, pitcher ids and scores; games
+      without a game_date cannot be placed in the season and are left out
+    Returns
+    - games with FEATURE_COLS and FORM_COLS, sorted by NRFIFeatures.GAME_ORDER
+    """
+    undated = games['game_date'].isna()
+    if undated.all():
+        raise ValueError(f"none of the {len(games)} games has a game_date; rerun nrfi.py to rebuild the table")
+    if undated.any():
+        print(f"Leaving out {int(undated.sum())} games without a game_date")
+        games = games[~undated]
+
+    teamsdf = pd.DataFrame({'Team': pd.unique(pd.concat([games['home_team'], games['away_team']]).astype(str))})
+    pitchers = pd.DataFrame({'pitcher': pd.unique(pd.concat([games['HomePitcherID'], games['AwayPitcherID']]))})
+    updated_games, _, _ = NRFIFeatures.update_database_vectorized(games, teamsdf, pitchers)
+    check_pregame_order(updated_games)
+
+    form_features, _ = NRFIForm.form_features(updated_games)
+    check_pregame_order(form_features.merge(updated_games[['game_pk', 'game_date']], on='game_pk', how='left'))
+    return updated_games.merge(form_features, on='game_pk')
+
+def _score_day(job):
+    """
+    Train on every game before the day and score the day's games.
+    Runs in a worker process, so it only takes and returns plain arrays.
+    """
+    day, X_train, y_train, X_day, y_day, nrfi_prob, random_state = job
+    dt_classifier = tree.DecisionTreeClassifier(random_state=random_state)
+    dt_classifier.fit(X_train, y_train)
+
+    pred = dt_classifier.predict(X_day)
+    proba = dt_classifier.predict_proba(X_day)
+    # probability assigned to the actual outcome (a class missing from training gets 0)
+    classes = list(dt_classifier.classes_)
+    p_true = np.zeros(len(y_day))
+    for i, cls in enumerate(classes):
+        p_true = np.where(y_day == cls, proba[:, i], p_true)
+    p_true = np.clip(p_true, 1e-15, 1)
+
+    # bet the side the tree picks at the model's own NRFIPrice (or the YRFI side of it)
+    price = np.where(pred == 1, Odds.prob_to_american(nrfi_prob), Odds.prob_to_american(1 - nrfi_prob))
+    has_price = ~np.isnan(price)
+    # flat 1 unit stake
+    profit = np.where((pred == y_day)[has_price], Odds.payout(1.0, price[has_price]), -1.0)
+
+    return {
+        'Date': day,
+        'Games': len(y_day),
+        'TrainGames': len(y_train),
+        'Correct': int((pred == y_day).sum()),
+        'LogLossSum': float(-np.log(p_true).sum()),
+        'Bets': int(has_price.sum()),
+        'Profit': float(profit.sum()),
+    }
+
+def walk_forward_backtest(games, feature_cols=NRFIForm.MODEL_COLS, min_train_games=100,
+                          max_workers=None, random_state=NRFIModelCache.MODEL_CONFIG['random_state']):
+    """
+    Walk-forward backtest over every game day, fanned out across a process pool.
+
+    Parameters
+    - games: DataFrame with game_date, NRFI and the pre-game feature columns
+    - feature_cols: model features
+    - min_train_games: skip days until at least this many earlier games exist
+    - max_workers: process pool size (None = one per core, 1 = run serially)
+    Returns
+    - daily DataFrame (one row per scored day), summary dict
+    """
+    if games['game_date'].isna().all():
+        raise ValueError("walk-forward backtest needs game dates; rerun nrfi.py to add them")
+
+    df = games.dropna(subset=['game_date']).sort_values(NRFIFeatures.GAME_ORDER, kind='stable').reset_index(drop=True)
+    days = pd.to_datetime(df['game_date']).dt.normalize()
+    X = df[feature_cols].to_numpy(dtype=float)
+    y = df['NRFI'].astype(int).to_numpy()
+    nrfi_prob = (1 - df[['Home_Pitcher_RAPF', 'Away_Pitcher_RAPF', 'Home_Team_RSPF', 'Away_Team_RSPF']].mean(axis=1)).to_numpy()
+
+    # rows are sorted by day, so "all games before D" is a prefix of the arrays
+    day_values, day_starts = np.unique(days.to_numpy(), return_index=True)
+    day_ends = np.append(day_starts[1:], len(df))
+    jobs = [
+        (pd.Timestamp(day), X[:start], y[:start], X[start:end], y[start:end], nrfi_prob[start:end], random_state)
+        for day, start, end in zip(day_values, day_starts, day_ends)
+        if start >= min_train_games
+    ]
+
+    if max_workers == 1:
+        results = [_score_day(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(_score_day, jobs, chunksize=max(1, len(jobs) // (4 * (os.cpu_count() or 1)))))
+
+    daily = pd.DataFrame(results, columns=['Date', 'Games', 'TrainGames', 'Correct', 'LogLossSum', 'Bets', 'Profit'])
+    daily['Accuracy'] = daily['Correct'] / daily['Games']
+    daily['LogLoss'] = daily['LogLossSum'] / daily['Games']
+    daily['ROI'] = daily['Profit'] / daily['Bets'].where(daily['Bets'] > 0)
+
+    total_games = daily['Games'].sum()
+    total_bets = daily['Bets'].sum()
+    summary = {
+        'Days': len(daily),
+        'Games': int(total_games),
+        'Accuracy': float(daily['Correct'].sum() / total_games) if total_games else np.nan,
+        'LogLoss': float(daily['LogLossSum'].sum() / total_games) if total_games else np.nan,
+        'Bets': int(total_bets),
+        'ROI': float(daily['Profit'].sum() / total_bets) if total_bets else np.nan,
+    }
+    return daily.drop(columns=['LogLossSum']), summary
+
+if __name__ == '__main__':
+    # python -m tools.NRFIBacktest
+    games = NRFIFeatures.load_game_table()
+    games['NRFI'] = games['home_score'] + games['away_score'] <= 0
+    daily, summary = walk_forward_backtest(pregame_features(games))
+    print(daily.to_string(index=False))
+    print(summary)
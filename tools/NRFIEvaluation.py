@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+
+from . import Odds
+
+##################################################
+# Historical NRFI evaluation
+# Hit rate and flat-stake ROI of the NRFI probability over every past game,
+# for a whole grid of confidence thresholds at once
+##################################################
+
+# bet NRFI when NRFIProb >= threshold, YRFI when NRFIProb < 1 - threshold
+DEFAULT_THRESHOLDS = np.round(np.arange(0.50, 0.801, 0.01), 2)
+MARKET_ODDS = -110
+
+def correct_predictions(prob, nrfi):
+    """
+    Vectorized replacement for the old row-by-row is_correct check.
+    A probability >= 0.5 calls NRFI, below 0.5 calls YRFI.
+
+    Parameters
+    - prob: NRFI probabilities
+    - nrfi: actual outcomes (True = no run scored in the first inning)
+    Returns
+    - float array: 1.0 correct, 0.0 wrong, NaN when prob/outcome is missing or prob is outside [0, 1]
+    """
+    prob = np.asarray(prob, dtype=float)
+    outcome = pd.Series(nrfi).astype(float).to_numpy()
+    valid = ~np.isnan(outcome) & (prob >= 0) & (prob <= 1)
+    correct = (prob >= 0.5) == (outcome == 1)
+    return np.where(valid, correct.astype(float), np.nan)
+
+def threshold_sweep(prob, nrfi, thresholds=DEFAULT_THRESHOLDS, nrfi_odds=MARKET_ODDS, yrfi_odds=MARKET_ODDS):
+    """
+    Hit rate and ROI for every threshold in one broadcast over a
+    (thresholds x games) grid.
+
+    Parameters
+    - prob: NRFI probabilities, one per game
+    - nrfi: actual outcomes, one per game
+    - thresholds: confidence levels (0.5-1) to sweep
+    - nrfi_odds, yrfi_odds: market price for each side, a single number or one per game
+    Returns
+    - DataFrame, one row per threshold: Threshold, FairPrice (the NRFI price the threshold
+      corresponds to), Bets, NRFIBets, YRFIBets, Wins, HitRate, Profit, ROI
+    """
+    prob = np.asarray(prob, dtype=float)
+    outcome = pd.Series(nrfi).astype(float).to_numpy()
+    valid = ~np.isnan(outcome) & (prob >= 0) & (prob <= 1)
+    prob, outcome = prob[valid], outcome[valid] == 1
+
+    # profit of a winning 1 unit bet on each side, per game
+    nrfi_win = np.broadcast_to(Odds.payout(1.0, nrfi_odds), np.shape(valid))[valid]
+    yrfi_win = np.broadcast_to(Odds.payout(1.0, yrfi_odds), np.shape(valid))[valid]
+
+    t = np.asarray(thresholds, dtype=float)[:, None]
+    bet_nrfi = prob[None, :] >= t
+    bet_yrfi = (prob[None, :] < 1 - t) & ~bet_nrfi
+    win_nrfi = bet_nrfi & outcome
+    win_yrfi = bet_yrfi & ~outcome
+
+    nrfi_bets = bet_nrfi.sum(axis=1)
+    yrfi_bets = bet_yrfi.sum(axis=1)
+    bets = nrfi_bets + yrfi_bets
+    wins = win_nrfi.sum(axis=1) + win_yrfi.sum(axis=1)
+    profit = (np.where(win_nrfi, nrfi_win, 0).sum(axis=1) + np.where(win_yrfi, yrfi_win, 0).sum(axis=1)
+              - (bets - wins))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        hit_rate = np.where(bets > 0, wins / bets, np.nan)
+        roi = np.where(bets > 0, profit / bets, np.nan)
+
+    return pd.DataFrame({
+        'Threshold': t[:, 0],
+        'FairPrice': Odds.prob_to_american(t[:, 0]),
+        'Bets': bets,
+        'NRFIBets': nrfi_bets,
+        'YRFIBets': yrfi_bets,
+        'Wins': wins,
+        'HitRate': hit_rate,
+        'Profit': np.round(profit, 2),
+        'ROI': roi,
+    })
+
+def evaluate_history(games, prob_col='NRFIProb', thresholds=DEFAULT_THRESHOLDS, odds=MARKET_ODDS):
+    """
+    Parameters
+    - games: DataFrame with the NRFI outcome and a probability column
+    Returns
+    - summary dict (games graded, hit rate), threshold sweep DataFrame
+    """
+    correct = correct_predictions(games[prob_col], games['NRFI'])
+    graded = ~np.isnan(correct)
+    summary = {
+        'Games': int(graded.sum()),
+        'HitRate': float(correct[graded].mean()) if graded.any() else np.nan,
+    }
+    return summary, threshold_sweep(games[prob_col], games['NRFI'], thresholds, odds, odds)
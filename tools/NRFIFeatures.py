@@ -0,0 +1,281 @@
+import pandas as pd
+import numpy as np
+
+##################################################
+# NRFI feature engine
+# "Stats as of before this game" for every team and starting pitcher
+##################################################
+
+GAMES_PATH = r'data/nrfi_games.parquet'
+
+# order games are accumulated in: the day they were played, then game_pk within
+# the day. game_pk alone puts makeup games (low game_pk, played late) too early
+GAME_ORDER = ['game_date', 'game_pk']
+
+FEATURE_COLS = [
+    'Home_Pitcher_RAPF',
+    'Away_Pitcher_RAPF',
+    'Home_Team_RSPF',
+    'Away_Team_RSPF'
+]
+
+def build_game_table(pitches):
+    """
+    Compact one-row-per-game table from first-inning Statcast pitches.
+
+    Statcast lists pitches latest first, so the first pitch row of a game was
+    thrown by the away starter (bottom of the 1st) and the last one by the home
+    starter (top of the 1st). Scores are the max seen in the first inning.
+
+    Parameters
+    - pitches: DataFrame of first-inning pitches with game_pk, home_team, away_team,
+      pitcher, player_name, home_score, away_score (and game_date when available)
+    Returns
+    - DataFrame with int32 ids, categorical team codes and int8 scores
+    """
+    grouped = pitches.groupby('game_pk', sort=True)
+    starters = grouped[['pitcher', 'player_name']]
+    away = starters.first().rename(columns={'pitcher': 'AwayPitcherID', 'player_name': 'AwayPitcherName'})
+    home = starters.last().rename(columns={'pitcher': 'HomePitcherID', 'player_name': 'HomePitcherName'})
+
+    info_cols = ['home_team', 'away_team']
+    if 'game_date' in pitches.columns:
+        info_cols = ['game_date'] + info_cols
+    games = grouped[info_cols].first() \
+        .join(grouped[['home_score', 'away_score']].max()) \
+        .join(home).join(away) \
+        .reset_index()
+    if 'game_date' not in games.columns:
+        games['game_date'] = pd.NaT
+    return compact_game_table(games)
+
+def compact_game_table(games):
+    """
+    Apply the stored game table dtypes (also used to re-compact game rows
+    concatenated from several shards, whose categories differ).
+    """
+    team_codes = pd.CategoricalDtype(sorted(set(games['home_team']) | set(games['away_team'])))
+    pitcher_names = pd.CategoricalDtype(sorted(set(games['HomePitcherName']) | set(games['AwayPitcherName'])))
+    return pd.DataFrame({
+        'game_pk': games['game_pk'].astype('int32'),
+        'game_date': pd.to_datetime(games['game_date']),
+        'home_team': games['home_team'].astype(team_codes),
+        'away_team': games['away_team'].astype(team_codes),
+        'home_score': games['home_score'].astype('int8'),
+        'away_score': games['away_score'].astype('int8'),
+        'HomePitcherID': games['HomePitcherID'].astype('int32'),
+        'AwayPitcherID': games['AwayPitcherID'].astype('int32'),
+        'HomePitcherName': games['HomePitcherName'].astype(pitcher_names),
+        'AwayPitcherName': games['AwayPitcherName'].astype(pitcher_names),
+    })
+
+def load_game_table(path=GAMES_PATH):
+    return pd.read_parquet(path)
+
+def _pregame_rate(keys, values, start_counts, start_sums):
+    """
+    Season-to-date rate for each row of a long table, excluding the row itself.
+
+    Parameters
+    - keys: Series of group keys (team code or pitcher id), already in game order
+    - values: Series of runs for that row
+    - start_counts/start_sums: Series indexed by key with totals before the first row
+    Returns
+    - numpy array of prior runs / prior games (0.0 when there are no prior games)
+    """
+    grouped = values.groupby(keys.values, sort=False, dropna=False)
+    prior_games = grouped.cumcount().to_numpy() + \
+        keys.map(start_counts).fillna(0).to_numpy()
+    prior_runs = (grouped.cumsum() - values).to_numpy() + \
+        keys.map(start_sums).fillna(0).to_numpy()
+    rate = np.zeros(len(values), dtype=float)
+    np.divide(prior_runs, prior_games, out=rate, where=prior_games > 0)
+    return rate
+
+def update_database_vectorized(dataset, teamsdf, pitchers, sort_keys=GAME_ORDER):
+    """
+    Columnar version of update_database_sequential. Each game is split into a
+    home/away team-game long table and a pitcher-game long table, and the
+    pre-game rates come from grouped cumulative sums shifted by one game.
+
+    Parameters
+    - dataset: DataFrame of games with home/away team, pitcher ids and scores
+    - teamsdf: DataFrame with columns ['Team','Games','RunsScored', ...]
+    - pitchers: DataFrame with columns ['pitcher','Appearances','RunsGivenUp', ...]
+    - sort_keys: list of column names to sort dataset by (default GAME_ORDER)
+    Returns
+    - updated_dataset (copy), updated_teamsdf, updated_pitchers
+    """
+    df = dataset.copy().reset_index(drop=True)
+    if sort_keys:
+        df = df.sort_values(sort_keys, ascending=True, kind='stable').reset_index(drop=True)
+
+    # Starting totals (normally zero at the start of a season)
+    teams_updated = teamsdf.set_index('Team').copy()
+    for col in ['Games', 'RunsScored']:
+        if col not in teams_updated.columns:
+            teams_updated[col] = 0
+    pitchers_updated = pitchers.set_index('pitcher').copy()
+    for col in ['Appearances', 'RunsGivenUp']:
+        if col not in pitchers_updated.columns:
+            pitchers_updated[col] = 0
+    start_games = teams_updated['Games'].groupby(level=0).last()
+    start_runs = teams_updated['RunsScored'].groupby(level=0).last()
+    start_apps = pitchers_updated['Appearances'].groupby(level=0).last()
+    start_given = pitchers_updated['RunsGivenUp'].groupby(level=0).last()
+
+    n = len(df)
+    home_score = df['home_score'] if 'home_score' in df.columns else pd.Series(0, index=df.index)
+    away_score = df['away_score'] if 'away_score' in df.columns else pd.Series(0, index=df.index)
+    # compact tables store scores as int8; widen before running season totals
+    if pd.api.types.is_integer_dtype(home_score):
+        home_score = home_score.astype('int64')
+    if pd.api.types.is_integer_dtype(away_score):
+        away_score = away_score.astype('int64')
+
+    # Long tables: rows 0..n-1 are the home side, n..2n-1 the away side.
+    # A stable sort on the game position keeps home before away inside a game,
+    # which matches the order the sequential loop reads and writes stats.
+    order = np.argsort(np.concatenate([np.arange(n), np.arange(n)]), kind='stable')
+
+    # group on plain values so categorical team codes behave like strings
+    team_keys = pd.concat([df['home_team'], df['away_team']], ignore_index=True).astype(object).iloc[order]
+    team_runs = pd.concat([home_score, away_score], ignore_index=True).iloc[order]
+    team_rate = np.empty(2 * n)
+    team_rate[order] = _pregame_rate(team_keys, team_runs, start_games, start_runs)
+
+    pitcher_keys = pd.concat([df['HomePitcherID'], df['AwayPitcherID']], ignore_index=True).iloc[order]
+    pitcher_runs = pd.concat([away_score, home_score], ignore_index=True).iloc[order]
+    pitcher_rate = np.empty(2 * n)
+    pitcher_rate[order] = _pregame_rate(pitcher_keys, pitcher_runs, start_apps, start_given)
+
+    df['Home_Team_RSPF'] = team_rate[:n]
+    df['Away_Team_RSPF'] = team_rate[n:]
+    df['Home_Pitcher_RAPF'] = pitcher_rate[:n]
+    df['Away_Pitcher_RAPF'] = pitcher_rate[n:]
+
+    # Season totals on top of the starting totals
+    team_totals = team_runs.groupby(team_keys.values).agg(['count', 'sum'])
+    teams_updated['Games'] = teams_updated.index.map(start_games) + \
+        team_totals['count'].reindex(teams_updated.index, fill_value=0).values
+    teams_updated['RunsScored'] = teams_updated.index.map(start_runs) + \
+        team_totals['sum'].reindex(teams_updated.index, fill_value=0).values
+    games = teams_updated['Games']
+    teams_updated['Team_RSPF'] = np.where(games > 0, teams_updated['RunsScored'] / games.where(games > 0, 1), 0.0)
+
+    pitcher_totals = pitcher_runs.groupby(pitcher_keys.values).agg(['count', 'sum'])
+    pitchers_updated['Appearances'] = pitchers_updated.index.map(start_apps) + \
+        pitcher_totals['count'].reindex(pitchers_updated.index, fill_value=0).values
+    pitchers_updated['RunsGivenUp'] = pitchers_updated.index.map(start_given) + \
+        pitcher_totals['sum'].reindex(pitchers_updated.index, fill_value=0).values
+    apps = pitchers_updated['Appearances']
+    pitchers_updated['Pitcher_RAPF'] = np.where(apps > 0, pitchers_updated['RunsGivenUp'] / apps.where(apps > 0, 1), 0.0)
+
+    return df, teams_updated.reset_index(), pitchers_updated.reset_index()
+
+def update_database_sequential(dataset, teamsdf, pitchers, sort_keys=GAME_ORDER):
+    """
+    Sequentially update dataset with team/pitcher stats and update teamsdf/pitchers
+    so each subsequent game sees the updated stats. Kept as the reference
+    implementation for update_database_vectorized.
+
+    Parameters
+    - dataset: DataFrame of games (will not be modified in-place unless you want)
+    - teamsdf: DataFrame with columns ['Team','Games','RunsScored', ...]
+    - pitchers: DataFrame with columns ['pitcher','Appearances','RunsGivenUp', ...]
+    - sort_keys: list of column names to sort dataset by (default GAME_ORDER)
+    Returns
+    - updated_dataset (copy), updated_teamsdf, updated_pitchers
+    """
+
+    # Work on copies to avoid surprising side effects
+    df = dataset.copy().reset_index(drop=True)
+    teams = teamsdf.set_index('Team').copy()
+    p = pitchers.set_index('pitcher').copy()
+
+    # Ensure numeric columns exist and fill missing with zeros
+    for col in ['Games', 'RunsScored']:
+        if col not in teams.columns:
+            teams[col] = 0
+    for col in ['Appearances', 'RunsGivenUp']:
+        if col not in p.columns:
+            p[col] = 0
+
+    # Create fast lookup dicts
+    team_games = teams['Games'].to_dict()
+    team_runs = teams['RunsScored'].to_dict()
+    pitcher_apps = p['Appearances'].to_dict()
+    pitcher_runs = p['RunsGivenUp'].to_dict()
+
+    # Optional sorting: ensure sequential order
+    if sort_keys:
+        df = df.sort_values(sort_keys, ascending=True, kind='stable').reset_index(drop=True)
+
+    # Prepare output columns
+    df['Home_Team_RSPF'] = np.nan
+    df['Away_Team_RSPF'] = np.nan
+    df['Home_Pitcher_RAPF'] = np.nan
+    df['Away_Pitcher_RAPF'] = np.nan
+
+    # Iterate sequentially
+    for idx, row in df.iterrows():
+        home_team = row['home_team']
+        away_team = row['away_team']
+        home_pitcher = row['HomePitcherID']
+        away_pitcher = row['AwayPitcherID']
+        home_score = row.get('home_score', 0)
+        away_score = row.get('away_score', 0)
+
+        # Get current team stats (defaults if missing)
+        hg = team_games.get(home_team, 0)
+        hr = team_runs.get(home_team, 0)
+        ag = team_games.get(away_team, 0)
+        ar = team_runs.get(away_team, 0)
+
+        # Compute RSPF safely (avoid division by zero)
+        home_rspf = hr / hg if hg > 0 else 0.0
+        away_rspf = ar / ag if ag > 0 else 0.0
+
+        # Get current pitcher stats (defaults if missing)
+        hap = pitcher_apps.get(home_pitcher, 0)
+        hrg = pitcher_runs.get(home_pitcher, 0)
+        aap = pitcher_apps.get(away_pitcher, 0)
+        arg = pitcher_runs.get(away_pitcher, 0)
+
+        home_rapf = hrg / hap if hap > 0 else 0.0
+        away_rapf = arg / aap if aap > 0 else 0.0
+
+        # Write current stats into the dataset row
+        df.at[idx, 'Home_Team_RSPF'] = home_rspf
+        df.at[idx, 'Away_Team_RSPF'] = away_rspf
+        df.at[idx, 'Home_Pitcher_RAPF'] = home_rapf
+        df.at[idx, 'Away_Pitcher_RAPF'] = away_rapf
+
+        # Now update team stats to include this game's results
+        team_games[home_team] = hg + 1
+        team_runs[home_team] = hr + home_score
+        team_games[away_team] = ag + 1
+        team_runs[away_team] = ar + away_score
+
+        # Update pitcher stats (appearances and runs given up)
+        pitcher_apps[home_pitcher] = hap + 1
+        pitcher_runs[home_pitcher] = hrg + away_score
+        pitcher_apps[away_pitcher] = aap + 1
+        pitcher_runs[away_pitcher] = arg + home_score
+
+    # After loop, recompute rates and write back to DataFrames if desired
+    teams_updated = teams.copy()
+    teams_updated['Games'] = teams_updated.index.map(lambda t: team_games.get(t, 0))
+    teams_updated['RunsScored'] = teams_updated.index.map(lambda t: team_runs.get(t, 0))
+    teams_updated['Team_RSPF'] = teams_updated.apply(
+        lambda r: (r['RunsScored'] / r['Games']) if r['Games'] > 0 else 0.0, axis=1
+    )
+
+    pitchers_updated = p.copy()
+    pitchers_updated['Appearances'] = pitchers_updated.index.map(lambda pid: pitcher_apps.get(pid, 0))
+    pitchers_updated['RunsGivenUp'] = pitchers_updated.index.map(lambda pid: pitcher_runs.get(pid, 0))
+    pitchers_updated['Pitcher_RAPF'] = pitchers_updated.apply(
+        lambda r: (r['RunsGivenUp'] / r['Appearances']) if r['Appearances'] > 0 else 0.0, axis=1
+    )
+
+    return df, teams_updated.reset_index(), pitchers_updated.reset_index()
@@ -0,0 +1,164 @@
+import numpy as np
+import pandas as pd
+
+from . import NRFIFeatures
+
+##################################################
+# Recent-form NRFI features
+# Last-N and exponentially weighted first-inning runs per pitcher and team.
+# Each tracker keeps fixed-size ring buffers and EW sums in arrays indexed by
+# a dense integer id, so folding in a game is O(1) whatever the season length.
+##################################################
+
+FORM_WINDOW = 5     # last N starts / games
+FORM_ALPHA = 0.25   # EW weight of the newest game
+
+FORM_COLS = [
+    f'Home_Pitcher_RAPF_L{FORM_WINDOW}',
+    f'Away_Pitcher_RAPF_L{FORM_WINDOW}',
+    f'Home_Team_RSPF_L{FORM_WINDOW}',
+    f'Away_Team_RSPF_L{FORM_WINDOW}',
+    'Home_Pitcher_RAPF_EW',
+    'Away_Pitcher_RAPF_EW',
+    'Home_Team_RSPF_EW',
+    'Away_Team_RSPF_EW',
+]
+
+# season-to-date rates plus recent form
+MODEL_COLS = NRFIFeatures.FEATURE_COLS + FORM_COLS
+
+def empty_tracker(window=FORM_WINDOW, alpha=FORM_ALPHA, capacity=64):
+    return {
+        'window': window,
+        'alpha': alpha,
+        'ids': {},                                           # key -> dense id
+        'ring': np.zeros((capacity, window), dtype=np.int16), # last N runs, oldest overwritten
+        'pos': np.zeros(capacity, dtype=np.int32),           # next ring slot
+        'count': np.zeros(capacity, dtype=np.int32),         # games seen (ring holds min(count, N))
+        'ring_sum': np.zeros(capacity, dtype=np.int32),
+        'ew_num': np.zeros(capacity, dtype=float),           # sum of decayed runs
+        'ew_den': np.zeros(capacity, dtype=float),           # sum of decayed weights
+    }
+
+def _grow(tracker):
+    # double every per-id array (amortized O(1) per new key)
+    for key in ['ring', 'pos', 'count', 'ring_sum', 'ew_num', 'ew_den']:
+        arr = tracker[key]
+        tracker[key] = np.concatenate([arr, np.zeros_like(arr)])
+
+def _index(tracker, key):
+    idx = tracker['ids'].get(key)
+    if idx is None:
+        idx = len(tracker['ids'])
+        if idx >= len(tracker['pos']):
+            _grow(tracker)
+        tracker['ids'][key] = idx
+    return idx
+
+def tracker_rates(tracker, key):
+    """
+    Returns
+    - (last-N mean, EW mean) before the next game; 0.0 with no games yet, NaN for an unknown key.
+      Until N games are in, the last-N mean averages the games there are (pandas'
+      shift().rolling(N, min_periods=1), not rolling(N), which would be NaN)
+    """
+    idx = tracker['ids'].get(key)
+    if idx is None:
+        return np.nan, np.nan
+    count = tracker['count'][idx]
+    if count == 0:
+        return 0.0, 0.0
+    last_n = tracker['ring_sum'][idx] / min(count, tracker['window'])
+    return float(last_n), float(tracker['ew_num'][idx] / tracker['ew_den'][idx])
+
+def tracker_update(tracker, key, runs):
+    idx = _index(tracker, key)
+    pos = tracker['pos'][idx]
+    tracker['ring_sum'][idx] += runs - tracker['ring'][idx, pos]
+    tracker['ring'][idx, pos] = runs
+    tracker['pos'][idx] = (pos + 1) % tracker['window']
+    tracker['count'][idx] += 1
+    decay = 1 - tracker['alpha']
+    tracker['ew_num'][idx] = decay * tracker['ew_num'][idx] + runs
+    tracker['ew_den'][idx] = decay * tracker['ew_den'][idx] + 1
+
+def empty_form(window=FORM_WINDOW, alpha=FORM_ALPHA):
+    return {'pitchers': empty_tracker(window, alpha), 'teams': empty_tracker(window, alpha)}
+
+def add_game(form, home_team, away_team, home_pitcher, away_pitcher, home_score, away_score):
+    """
+    Pre-game form features for one game (in FORM_COLS order), then fold the game in.
+    Pitchers are charged the runs the other team scored; teams are credited their own.
+    """
+    pitchers, teams = form['pitchers'], form['teams']
+    hp_last, hp_ew = tracker_rates(pitchers, home_pitcher)
+    ap_last, ap_ew = tracker_rates(pitchers, away_pitcher)
+    ht_last, ht_ew = tracker_rates(teams, home_team)
+    at_last, at_ew = tracker_rates(teams, away_team)
+
+    tracker_update(teams, home_team, home_score)
+    tracker_update(teams, away_team, away_score)
+    tracker_update(pitchers, home_pitcher, away_score)
+    tracker_update(pitchers, away_pitcher, home_score)
+
+    # a first appearance has no history yet: 0.0 like the season-to-date rates
+    return [np.nan_to_num(v) for v in (hp_last, ap_last, ht_last, at_last, hp_ew, ap_ew, ht_ew, at_ew)]
+
+def form_features(games, form=None, sort_keys=NRFIFeatures.GAME_ORDER):
+    """
+    Pre-game form features for every game, processed in sort_keys order.
+
+    Parameters
+    - games: game table (home/away team, pitcher ids, scores)
+    - form: trackers to continue from (default: a fresh season)
+    - sort_keys: processing order (default NRFIFeatures.GAME_ORDER, so a makeup
+      game with a low game_pk is folded in on the day it was played)
+    Returns
+    - DataFrame with game_pk + FORM_COLS in processing order, form after the last game
+    """
+    form = form if form is not None else empty_form()
+    ordered = games.sort_values(sort_keys, kind='stable')
+    rows = [
+        add_game(form, str(g.home_team), str(g.away_team), int(g.HomePitcherID), int(g.AwayPitcherID),
+                 int(g.home_score), int(g.away_score))
+        for g in ordered.itertuples(index=False)
+    ]
+    features = pd.DataFrame(rows, columns=FORM_COLS, dtype=float)
+    features.insert(0, 'game_pk', ordered['game_pk'].astype(int).to_numpy())
+    return features, form
+
+def current_form(form, keys, kind):
+    """
+    Form going into the next game for a column of keys (today's starters or teams).
+
+    Parameters
+    - keys: pitcher ids (kind='pitchers') or team codes (kind='teams'); missing keys give NaN
+    Returns
+    - DataFrame with columns LastN and EW, aligned with keys
+    """
+    tracker = form[kind]
+    keys = pd.Series(keys)
+    rates = [tracker_rates(tracker, None if pd.isna(k) else (int(k) if kind == 'pitchers' else str(k)))
+             for k in keys]
+    return pd.DataFrame(rates, columns=['LastN', 'EW'], index=keys.index, dtype=float)
+
+def form_to_json(form):
+    return {kind: {
+        'window': t['window'],
+        'alpha': t['alpha'],
+        'keys': list(t['ids']),
+        **{key: t[key][:len(t['ids'])].tolist() for key in ['ring', 'pos', 'count', 'ring_sum', 'ew_num', 'ew_den']},
+    } for kind, t in form.items()}
+
+def form_from_json(data):
+    form = {}
+    for kind, t in data.items():
+        tracker = empty_tracker(t['window'], t['alpha'], capacity=max(64, len(t['keys'])))
+        n = len(t['keys'])
+        # JSON keys lose their type; pitcher ids are ints
+        tracker['ids'] = {(int(k) if kind == 'pitchers' else str(k)): i for i, k in enumerate(t['keys'])}
+        for key in ['ring', 'pos', 'count', 'ring_sum', 'ew_num', 'ew_den']:
+            if n:
+                tracker[key][:n] = np.asarray(t[key], dtype=tracker[key].dtype)
+        form[kind] = tracker
+    return form
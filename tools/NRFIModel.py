@@ -1,462 +1,225 @@
+import json
+import os
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
 import streamlit as st
 import pandas as pd
-import requests
-from bs4 import BeautifulSoup as bs
-import regex as re
 import numpy as np
 
-import sklearn.model_selection as model_selection
-import sklearn.tree as tree
-import sklearn.metrics as metrics
-
-def app():
-
-    st.title("💸 No Runs In The First Inning (NRFI) Model")
-    st.markdown("Analytically predict if a run will score in the first inning of today's baseball games.")
-    st.markdown("Explanation of the table and model below!")
-
-
-    #load in data
-    df2 = pd.read_csv(r'data/nrfi.csv').reset_index(drop=True)
-
-    # get teams
-    teams = ['BOS', 'CWS', 'CLE', 'COL', 'LAA', 'MIA', 'MIN', 'PIT', 'SF', 'TB',
-        'TEX', 'WSH', 'AZ', 'ATH', 'NYY','CIN', 'DET', 'SD', 'PHI', 'CHC',
-        'MIL', 'BAL', 'KC', 'HOU', 'ATL','SEA', 'LAD', 'STL', 'TOR', 'NYM']
+from . import NRFIFeatures
+from . import NRFIState
+from . import NRFIModelCache
+from . import ProbableStarters
+from . import PlayerIds
+from . import Odds
+from . import NRFIEvaluation
+from . import NRFIForm
+
+# today's slate, written once a day by nrfi-slate.py and rendered by app()
+SLATE_PATH = r'data/nrfi_slate.json'
+
+# MLB slates are dated in Eastern time (the nightly job and the hosted app run in UTC)
+SLATE_TZ = ZoneInfo('America/New_York')
+
+# get teams
+teams = ['BOS', 'CWS', 'CLE', 'COL', 'LAA', 'MIA', 'MIN', 'PIT', 'SF', 'TB',
+    'TEX', 'WSH', 'AZ', 'ATH', 'NYY','CIN', 'DET', 'SD', 'PHI', 'CHC',
+    'MIL', 'BAL', 'KC', 'HOU', 'ATL','SEA', 'LAD', 'STL', 'TOR', 'NYM']
+
+# mapping function to convert team names to initials
+def mapTeamInitials(col):
+    teamInitialsMapping = {'Arizona Diamondbacks':'AZ',
+    'Atlanta Braves':'ATL',
+    'Baltimore Orioles':'BAL',
+    'Boston Red Sox':'BOS',
+    'Chicago Cubs':'CHC',
+    'Chicago White Sox':'CWS',
+    'Cincinnati Reds':'CIN',
+    'Cleveland Guardians':'CLE',
+    'Colorado Rockies':'COL',
+    'Detroit Tigers':'DET',
+    'Houston Astros':'HOU',
+    'Kansas City Royals':'KC',
+    'Los Angeles Angels':'LAA',
+    'Los Angeles Dodgers':'LAD',
+    'Miami Marlins':'MIA',
+    'Milwaukee Brewers':'MIL',
+    'Minnesota Twins':'MIN',
+    'New York Mets':'NYM',
+    'New York Yankees':'NYY',
+    'Oakland Athletics':'ATH',
+    'Athletics': 'ATH',
+    'Philadelphia Phillies':'PHI',
+    'Pittsburgh Pirates':'PIT',
+    'San Diego Padres':'SD',
+    'San Francisco Giants':'SF',
+    'Seattle Mariners':'SEA',
+    'St. Louis Cardinals':'STL',
+    'Tampa Bay Rays':'TB',
+    'Texas Rangers':'TEX',
+    'Toronto Blue Jays':'TOR',
+    'Washington Nationals':'WSH'}
+    return col.map(teamInitialsMapping)
+
+def slate_date():
+    return datetime.now(SLATE_TZ).strftime('%Y-%m-%d')
+
+############################################
+# Season history
+############################################
+
+def loadHistory():
+    """
+    Returns
+    - updated_games: every game with the pre-game RAPF/RSPF features and NRFI outcome
+    - updated_teamsdf, updated_pitchers: season-to-date team and pitcher totals
+    - form: last-N / EW trackers after the last game
+    """
+    #load in data (one row per game, written by nrfi.py)
+    gameinfo = NRFIFeatures.load_game_table()
 
     teamsdf = pd.DataFrame(teams, columns=['Team'])
     teamsdf['Games'] = 0
     teamsdf['RunsScored'] = 0
     teamsdf['Team_RSPF'] = 0.0
 
-    # get pitchers
-    pitchers = df2[['player_name', 'pitcher']].drop_duplicates(keep='first').reset_index(drop=True)
+    # get pitchers (away starters first, as they appear first in Statcast)
+    pitchers = pd.concat([
+        gameinfo[['AwayPitcherName', 'AwayPitcherID']].set_axis(['player_name', 'pitcher'], axis=1),
+        gameinfo[['HomePitcherName', 'HomePitcherID']].set_axis(['player_name', 'pitcher'], axis=1)
+    ], ignore_index=True).astype({'player_name': str}).drop_duplicates(keep='first').reset_index(drop=True)
     pitchers['Appearances'] = 0
     pitchers['RunsGivenUp'] = 0
     pitchers['Pitcher_RAPF'] = 0.0
 
-    # Away pitchers
-    away = (
-        df2
-        .groupby(["game_pk", "away_team"])["pitcher"]
-        .first()
-        .reset_index()
-        .rename(columns={"pitcher": "AwayPitcherID"})
-    )
-
-    # Home pitchers
-    home = (
-        df2
-        .groupby(["game_pk", "home_team"])["pitcher"]
-        .last()
-        .reset_index()
-        .rename(columns={"pitcher": "HomePitcherID"})
-    )
-
-    # Merge into final table
-    gamepitchers = (
-        away.merge(home, on="game_pk", how="inner")
-            .drop(columns=["away_team", "home_team"])
-    )
-
-    ## Game / NRFI info
-    gameinfo = df2.groupby(["game_pk"]).max()
-    gameinfo = gameinfo[['home_team', 'away_team','home_score', 'away_score']].reset_index()
-    gameinfo = gameinfo.merge(gamepitchers, on="game_pk", how="inner")
-
-    #create columns for team/pitcher cumulative stats
-    gameinfo['Home_Pitcher_RAPF'] = 0.0
-    gameinfo['Away_Pitcher_RAPF'] = 0.0
-    gameinfo['Home_Team_RSPF'] = 0.0
-    gameinfo['Away_Team_RSPF'] = 0.0
-
     # add NRFI to game info
     gameinfo['NRFI'] = gameinfo['home_score'] + gameinfo['away_score'] <= 0
 
-    ########################################
-    # Function to update database
-    ########################################
-    def update_database_sequential(dataset, teamsdf, pitchers, sort_keys='game_pk'):
-        """
-        Sequentially update dataset with team/pitcher stats and update teamsdf/pitchers
-        so each subsequent game sees the updated stats.
-
-        Parameters
-        - dataset: DataFrame of games (will not be modified in-place unless you want)
-        - teamsdf: DataFrame with columns ['Team','Games','RunsScored', ...]
-        - pitchers: DataFrame with columns ['pitcher','Appearances','RunsGivenUp', ...]
-        - sort_keys: list of column names to sort dataset by (e.g., ['game_date','game_pk'])
-        Returns
-        - updated_dataset (copy), updated_teamsdf, updated_pitchers
-        """
-
-        # Work on copies to avoid surprising side effects
-        df = dataset.copy().reset_index(drop=True)
-        teams = teamsdf.set_index('Team').copy()
-        p = pitchers.set_index('pitcher').copy()
-
-        # Ensure numeric columns exist and fill missing with zeros
-        for col in ['Games', 'RunsScored']:
-            if col not in teams.columns:
-                teams[col] = 0
-        for col in ['Appearances', 'RunsGivenUp']:
-            if col not in p.columns:
-                p[col] = 0
-
-        # Create fast lookup dicts
-        team_games = teams['Games'].to_dict()
-        team_runs = teams['RunsScored'].to_dict()
-        pitcher_apps = p['Appearances'].to_dict()
-        pitcher_runs = p['RunsGivenUp'].to_dict()
-
-        # Optional sorting: ensure sequential order
-        if sort_keys:
-            df = df.sort_values(sort_keys, ascending=True).reset_index(drop=True)
-
-        # Prepare output columns
-        df['Home_Team_RSPF'] = np.nan
-        df['Away_Team_RSPF'] = np.nan
-        df['Home_Pitcher_RAPF'] = np.nan
-        df['Away_Pitcher_RAPF'] = np.nan
-
-        # Iterate sequentially
-        for idx, row in df.iterrows():
-            home_team = row['home_team']
-            away_team = row['away_team']
-            home_pitcher = row['HomePitcherID']
-            away_pitcher = row['AwayPitcherID']
-            home_score = row.get('home_score', 0)
-            away_score = row.get('away_score', 0)
-
-            # Get current team stats (defaults if missing)
-            hg = team_games.get(home_team, 0)
-            hr = team_runs.get(home_team, 0)
-            ag = team_games.get(away_team, 0)
-            ar = team_runs.get(away_team, 0)
-
-            # Compute RSPF safely (avoid division by zero)
-            home_rspf = hr / hg if hg > 0 else 0.0
-            away_rspf = ar / ag if ag > 0 else 0.0
-
-            # Get current pitcher stats (defaults if missing)
-            hap = pitcher_apps.get(home_pitcher, 0)
-            hrg = pitcher_runs.get(home_pitcher, 0)
-            aap = pitcher_apps.get(away_pitcher, 0)
-            arg = pitcher_runs.get(away_pitcher, 0)
-
-            home_rapf = hrg / hap if hap > 0 else 0.0
-            away_rapf = arg / aap if aap > 0 else 0.0
-
-            # Write current stats into the dataset row
-            df.at[idx, 'Home_Team_RSPF'] = home_rspf
-            df.at[idx, 'Away_Team_RSPF'] = away_rspf
-            df.at[idx, 'Home_Pitcher_RAPF'] = home_rapf
-            df.at[idx, 'Away_Pitcher_RAPF'] = away_rapf
-
-            # Now update team stats to include this game's results
-            team_games[home_team] = hg + 1
-            team_runs[home_team] = hr + home_score
-            team_games[away_team] = ag + 1
-            team_runs[away_team] = ar + away_score
-
-            # Update pitcher stats (appearances and runs given up)
-            pitcher_apps[home_pitcher] = hap + 1
-            pitcher_runs[home_pitcher] = hrg + away_score
-            pitcher_apps[away_pitcher] = aap + 1
-            pitcher_runs[away_pitcher] = arg + home_score
-
-        # After loop, recompute rates and write back to DataFrames if desired
-        teams_updated = teams.copy()
-        teams_updated['Games'] = teams_updated.index.map(lambda t: team_games.get(t, 0))
-        teams_updated['RunsScored'] = teams_updated.index.map(lambda t: team_runs.get(t, 0))
-        teams_updated['Team_RSPF'] = teams_updated.apply(
-            lambda r: (r['RunsScored'] / r['Games']) if r['Games'] > 0 else 0.0, axis=1
-        )
-
-        pitchers_updated = p.copy()
-        pitchers_updated['Appearances'] = pitchers_updated.index.map(lambda pid: pitcher_apps.get(pid, 0))
-        pitchers_updated['RunsGivenUp'] = pitchers_updated.index.map(lambda pid: pitcher_runs.get(pid, 0))
-        pitchers_updated['Pitcher_RAPF'] = pitchers_updated.apply(
-            lambda r: (r['RunsGivenUp'] / r['Appearances']) if r['Appearances'] > 0 else 0.0, axis=1
-        )
-
-        return df, teams_updated.reset_index(), pitchers_updated.reset_index()
-
-    # call function to update database sequentially
-    updated_games, updated_teamsdf, updated_pitchers = update_database_sequential(
-        dataset=gameinfo,
-        teamsdf=teamsdf,
-        pitchers=pitchers
+    # fold games played since the last refresh into the saved team/pitcher totals
+    nrfi_state = NRFIState.load_state()
+    nrfi_state, new_games = NRFIState.refresh_state(nrfi_state, gameinfo)
+    if new_games > 0:
+        try:
+            NRFIState.save_state(nrfi_state)
+        except OSError:
+            pass  # read-only deploys just redo the fold on the next view
+    updated_games, updated_teamsdf, updated_pitchers = NRFIState.state_frames(
+        nrfi_state, gameinfo, teamsdf, pitchers
     )
 
-    updated_pitchers['player_name'] = updated_pitchers['player_name'].str.replace(
-        r'^(.*),\s*(.*)$', r'\2 \1', regex=True
-    )
-    ##Remove accents from names
-    player_name_mapping = {'á': 'a',
-            'é': 'e',
-            'É': 'e',
-            'í': 'i',
-            'ó': 'o',
-            'ú': 'u',
-            'ñ': 'n',
-            'ö': 'o',
-            'ü': 'u',
-            'č': 'c',
-            'ć': 'c'
-            }
-    updated_pitchers['player_name'] = updated_pitchers['player_name'].replace(player_name_mapping, regex=True)
-
-    ############################################
-    # Today's games
-    ############################################
-
-    # mapping function to convert team names to initials
-    def mapTeamInitials(col):
-        teamInitialsMapping = {'Arizona Diamondbacks':'AZ',
-        'Atlanta Braves':'ATL',
-        'Baltimore Orioles':'BAL',
-        'Boston Red Sox':'BOS',
-        'Chicago Cubs':'CHC',
-        'Chicago White Sox':'CWS',
-        'Cincinnati Reds':'CIN',
-        'Cleveland Guardians':'CLE',
-        'Colorado Rockies':'COL',
-        'Detroit Tigers':'DET',
-        'Houston Astros':'HOU',
-        'Kansas City Royals':'KC',
-        'Los Angeles Angels':'LAA',
-        'Los Angeles Dodgers':'LAD',
-        'Miami Marlins':'MIA',
-        'Milwaukee Brewers':'MIL',
-        'Minnesota Twins':'MIN',
-        'New York Mets':'NYM',
-        'New York Yankees':'NYY',
-        'Oakland Athletics':'ATH',
-        'Athletics': 'ATH',
-        'Philadelphia Phillies':'PHI',
-        'Pittsburgh Pirates':'PIT',
-        'San Diego Padres':'SD',
-        'San Francisco Giants':'SF',
-        'Seattle Mariners':'SEA',
-        'St. Louis Cardinals':'STL',
-        'Tampa Bay Rays':'TB',
-        'Texas Rangers':'TEX',
-        'Toronto Blue Jays':'TOR',
-        'Washington Nationals':'WSH'}
-        return col.map(teamInitialsMapping)
-
-    #Sortable NRFI Price
-    def sortablePrice(x):
-        if pd.isna(x) or x < 0 or x > 1 or x == 0 or x == 1:
-            return np.nan
-        #nrfi chance > 0.5
-        elif x > 0.5:
-            price = int(round(((x/(1-x))*100)*-1,0))
-            return(price)
-        #nrfi chance < 0.5, but not 0
-        #### NO PLUS SIGN FOR SORTING PURPOSES
-        elif x < 0.5 and x > 0:
-            price = int(round((((1-x)/x)*100),0))
-            return(price)
-        elif x == 0.5:
-            return(100)
-        else:
-            return np.nan
+    # today's starters are joined on MLBAM id, one row per pitcher
+    updated_pitchers = updated_pitchers.drop_duplicates('pitcher')
+    updated_pitchers['pitcher'] = updated_pitchers['pitcher'].astype('Int64')
 
     # calculate NRFI probability as 1 - average of the 4 stats
     updated_games['NRFIProb'] = (1 - ((updated_games['Home_Pitcher_RAPF'] + \
                                   updated_games['Away_Pitcher_RAPF'] + \
                                     updated_games['Home_Team_RSPF'] + \
                                         updated_games['Away_Team_RSPF'])/4))
-    updated_games['NRFIPrice'] = updated_games['NRFIProb'].apply(lambda x: sortablePrice(x))
+    updated_games['NRFIPrice'] = Odds.prob_to_american(updated_games['NRFIProb'])
+    return updated_games, updated_teamsdf, updated_pitchers, NRFIState.state_form(nrfi_state)
+
+############################################
+# Today's games
+############################################
+
+#function to get matchups and pitchers for each game
+def getProbStarters():
+    #get site and parse each matchup (away starter, home starter) in one pass
+    html = ProbableStarters.fetch_probable_starters_html()
+    records = ProbableStarters.parse_probable_starters(html)
+
+    #convert matchups into a pandas dataframe (to align with nrfi program)
+    matchupDF = ProbableStarters.probable_starters_frame(records)
+    matchupDF["AwayTeam"] = mapTeamInitials(matchupDF["AwayTeam"])
+    matchupDF["HomeTeam"] = mapTeamInitials(matchupDF["HomeTeam"])
+
+    #starters whose link has no id fall back to the shared name index
+    for side in ["Home", "Away"]:
+        missing = matchupDF[f"{side}PitcherID"].isna() & (matchupDF[f"{side}Pitcher"] != "TBD")
+        if missing.any():
+            matchupDF.loc[missing, f"{side}PitcherID"] = PlayerIds.resolve_ids(matchupDF.loc[missing, f"{side}Pitcher"])
+
+    return matchupDF
+
+def getNRFIPrice(nrfiTable, appendPrice_):
+    #if I decide I do not want to append the NRFI price, skip function
+    if appendPrice_ == False:
+        return nrfiTable
+
+    else:
+        #get expected runs in the first inning based off of the 4 factors:
+        ##away pitcher RAPF, home pitcher RAPF, away team RPF, home team RPF averaged
+        ###subtract 1 to get expected prob for no runs
+        expectedNRFIProb = 1 - ((nrfiTable['Home_Pitcher_RAPF'] + nrfiTable['Away_Pitcher_RAPF'] + \
+                                nrfiTable['Home_Team_RSPF'] + nrfiTable['Away_Team_RSPF'])/4)
+
+        #convert each NRFI prob into american odds (think moneyline value)
+        ##sortable price has no plus sign, display price does
+        nrfiPriceSort = Odds.prob_to_american(expectedNRFIProb)
+        nrfiPrice = Odds.format_american(nrfiPriceSort)
+        #add YRFI price to table as well
+        # yrfiPrice = Odds.format_american(Odds.prob_to_american(1 - expectedNRFIProb))
+
+        #append prices to final prediction output
+        nrfiTable["NRFIPrice"] = nrfiPrice
+        nrfiTable["Sort_Price"] = nrfiPriceSort
+        #nrfiTable["YRFIPrice"] = yrfiPrice
+        return nrfiTable
+
+def buildSlate():
+    """
+    Full NRFI pipeline: replay the season, load (or train) the model, scrape
+    today's probable starters and price/predict every matchup.
+
+    Returns
+    - slate dict: date, generated_at, probStarters table, historical summary, threshold sweep
+      and the model's feature importances
+    """
+    updated_games, updated_teamsdf, updated_pitchers, form = loadHistory()
 
     ### Analysis
-    def is_correct(prob, nrfi):
-        if pd.isna(prob) or pd.isna(nrfi) or prob < 0 or prob > 1:
-            return np.nan
-        if prob >= 0.5 and nrfi == True:
-            return True
-        elif prob < 0.5 and nrfi == False:
-            return True
-        elif prob >= 0.5 and nrfi == False:
-            return False
-        else:
-            return False
-    nrfi_backtest_analyze = updated_games[['game_pk', 'NRFI', 'NRFIProb']]
-    nrfi_backtest_analyze = updated_games.loc[:, ['game_pk', 'NRFI', 'NRFIProb']].copy()
-    nrfi_backtest_analyze.loc[:, 'Correct'] = nrfi_backtest_analyze.apply(
-        lambda row: is_correct(row['NRFIProb'], row['NRFI']),
-        axis=1
-    )
-    #correct_pct = nrfi_backtest_analyze['Correct'].dropna().mean() * 100
-    #nrfi_backtest_analyze.value_counts('Correct')
+    # hit rate and ROI of NRFIProb over every past game, for a grid of thresholds
+    nrfi_history, nrfi_sweep = NRFIEvaluation.evaluate_history(updated_games)
 
     #### ML MODEL
-    feature_cols = [
-        'Home_Pitcher_RAPF',
-        'Away_Pitcher_RAPF',
-        'Home_Team_RSPF',
-        'Away_Team_RSPF'
-    ]
+    feature_cols = NRFIForm.MODEL_COLS
     X = updated_games[feature_cols]
     y = updated_games['NRFI'].astype(int)
 
-    splitratios = [0.2, 0.3, 0.4]*3
-
-    best_dt_classifier = []
-    best_acc = [0]
-    final_sr = 0
-    final_X = None
-    final_X_train_shape = None
-    final_X_test_shape = None
-
-    for sr in splitratios:
-        X_train, X_test, y_train, y_test = model_selection.train_test_split(X, y, test_size=sr, random_state=42)
-        # Decision Tree
-        dt_classifier = tree.DecisionTreeClassifier()
-        dt_classifier.fit(X_train, y_train)
-        predictions = dt_classifier.predict(X_test)
-        accuracy = metrics.accuracy_score(y_test, predictions)
-
-        #get all stats for best DT model
-        if accuracy > best_acc[-1]:
-            #print("reached")
-            best_dt_classifier.append(dt_classifier)
-            best_acc.append(accuracy)
-            final_sr = sr
-            final_X = X
-            final_X_train_shape = X_train.shape
-            final_X_test_shape = X_test.shape
-        #print(sr, accuracy)
+    # trained once per data version, then loaded from disk
+    nrfi_model = NRFIModelCache.load_or_train(X, y)
+    best_dt_classifier = nrfi_model['model']
 
     # Display Results
-    #print(f"\nResults for Decision Tree (Split Ratio: {final_sr}):")
-    #print(f"Best Accuracy: {best_acc[-1]:.3f}")
+    #print(f"\nResults for Decision Tree (Split Ratio: {nrfi_model['split_ratio']}):")
+    #print(f"Best Accuracy: {nrfi_model['accuracy']:.3f}")
 
-    # Find importance of variables
-    impVals = list(best_dt_classifier[-1].feature_importances_)
-    colNames = list(best_dt_classifier[-1].feature_names_in_)
-    for i in range(final_X.shape[1]):
-        print(colNames[i],":",impVals[i])
-
-    #print(X_test)
-    #print(dt_classifier.predict(X_test.iloc[0:1,]))
+    # Find importance of variables (kept with the slate)
+    importances = dict(zip(nrfi_model['feature_names'], best_dt_classifier.feature_importances_.tolist()))
 
     #print shape of test and train
-    #print("Training shape:",final_X_train_shape)
-    #print("Testing shape:",final_X_test_shape)
+    #print("Training shape:",nrfi_model['train_shape'])
+    #print("Testing shape:",nrfi_model['test_shape'])
 
     ### Implement ML into probable startes
-    def mapTeamInitials(col):
-        teamInitialsMapping = {'Arizona Diamondbacks':'AZ',
-        'Atlanta Braves':'ATL',
-        'Baltimore Orioles':'BAL',
-        'Boston Red Sox':'BOS',
-        'Chicago Cubs':'CHC',
-        'Chicago White Sox':'CWS',
-        'Cincinnati Reds':'CIN',
-        'Cleveland Guardians':'CLE',
-        'Colorado Rockies':'COL',
-        'Detroit Tigers':'DET',
-        'Houston Astros':'HOU',
-        'Kansas City Royals':'KC',
-        'Los Angeles Angels':'LAA',
-        'Los Angeles Dodgers':'LAD',
-        'Miami Marlins':'MIA',
-        'Milwaukee Brewers':'MIL',
-        'Minnesota Twins':'MIN',
-        'New York Mets':'NYM',
-        'New York Yankees':'NYY',
-        'Oakland Athletics':'ATH',
-        'Athletics': 'ATH',
-        'Philadelphia Phillies':'PHI',
-        'Pittsburgh Pirates':'PIT',
-        'San Diego Padres':'SD',
-        'San Francisco Giants':'SF',
-        'Seattle Mariners':'SEA',
-        'St. Louis Cardinals':'STL',
-        'Tampa Bay Rays':'TB',
-        'Texas Rangers':'TEX',
-        'Toronto Blue Jays':'TOR',
-        'Washington Nationals':'WSH'}
-        return col.map(teamInitialsMapping)
-
-    #function to get matchups and pitchers for each game
-    #def getProbStarters(awayPitcherDict, homePitcherDict, teamCodeDict):
-    def getProbStarters():
-        #get site
-        url = "https://baseballsavant.mlb.com/probable-pitchers"
-        site = requests.get(url)
-        #get html content of site
-        content = bs(site.content)
-
-        #matchups
-        matchups = []
-        _matchups = [i.text for i in content.find_all('h2')]
-        for m in _matchups:
-            matchups.append(re.findall('(.*)\s@', m)[0])
-            matchups.append(re.findall('@\s(.*)', m)[0])
-
-        ##fix "finding pitchers algorithm" by including a combined regex statement
-        regex1 = r"<h3>(To be announced.)</h3>" #find any TBD spots
-        regex2 = r"<a class=\"matchup-link\".*>(.*)<" #find all pitcher names
-        combined_regex = "|".join([regex1, regex2])
-        #pitchers
-        players = []
-        _players = re.findall(combined_regex, str(content)) #find all players or TBD in website
-        for i in _players:
-            if i[0] == 'To be announced.':
-                players.append("TBD")
-            elif (i[1] != 'To be announced.') and (i[1] != ''):
-                players.append(i[1])
-
-        #make a list of lists for away/home pitcher info
-        matchupInfo = []
-        for m0 in range(0,len(matchups),2):
-            #print(m0)
-            #home pitcher, away pitcher, hometeam, awayteam
-            matchupInfo.append([players[m0+1],players[m0],  matchups[m0+1], matchups[m0]])
-        
-        #convert matchups into a pandas dataframe (to align with nrfi program)
-        matchupDF = pd.DataFrame(matchupInfo, columns=["HomePitcher", "AwayPitcher", "HomeTeam", "AwayTeam"])
-        matchupDF["AwayTeam"] = mapTeamInitials(matchupDF["AwayTeam"])
-        matchupDF["HomeTeam"] = mapTeamInitials(matchupDF["HomeTeam"])
-
-        ##Remove accents from names
-        player_name_mapping = {'á': 'a',
-            'é': 'e',
-            'É': 'e',
-            'í': 'i',
-            'ó': 'o',
-            'ú': 'u',
-            'ñ': 'n',
-            'ö': 'o',
-            'ü': 'u',
-            'č': 'c',
-            'ć': 'c'
-            }
-        matchupDF["AwayPitcher"]=matchupDF["AwayPitcher"].replace(player_name_mapping, regex=True)
-        matchupDF["HomePitcher"]=matchupDF["HomePitcher"].replace(player_name_mapping, regex=True)
-
-        return matchupDF
-
     todayStarters = getProbStarters()
-    
+
     ### Merge in stats
     home_pitchers = updated_pitchers.rename(columns={
-        'player_name': 'HomePitcher',
+        'pitcher': 'HomePitcherID',
         'Appearances': 'Home_Appearances',
         'RunsGivenUp': 'Home_RunsGivenUp',
         'Pitcher_RAPF': 'Home_Pitcher_RAPF'
-    })[['HomePitcher', 'Home_Appearances', 'Home_RunsGivenUp', 'Home_Pitcher_RAPF']]
+    })[['HomePitcherID', 'Home_Appearances', 'Home_RunsGivenUp', 'Home_Pitcher_RAPF']]
 
     away_pitchers = updated_pitchers.rename(columns={
-        'player_name': 'AwayPitcher',
+        'pitcher': 'AwayPitcherID',
         'Appearances': 'Away_Appearances',
         'RunsGivenUp': 'Away_RunsGivenUp',
         'Pitcher_RAPF': 'Away_Pitcher_RAPF'
-    })[['AwayPitcher', 'Away_Appearances', 'Away_RunsGivenUp', 'Away_Pitcher_RAPF']]
+    })[['AwayPitcherID', 'Away_Appearances', 'Away_RunsGivenUp', 'Away_Pitcher_RAPF']]
 
     home_teams = updated_teamsdf.rename(columns={
         'Team': 'HomeTeam',
@@ -474,81 +237,33 @@ def app():
 
     todayStarters_expanded = (
         todayStarters
-        .merge(home_pitchers, on='HomePitcher', how='left')
-        .merge(away_pitchers, on='AwayPitcher', how='left')
+        .merge(home_pitchers, on='HomePitcherID', how='left')
+        .merge(away_pitchers, on='AwayPitcherID', how='left')
         .merge(home_teams, on='HomeTeam', how='left')
         .merge(away_teams, on='AwayTeam', how='left')
     )
 
+    # recent form going into today's games
+    for side in ['Home', 'Away']:
+        pitcher_form = NRFIForm.current_form(form, todayStarters_expanded[f'{side}PitcherID'], 'pitchers')
+        team_form = NRFIForm.current_form(form, todayStarters_expanded[f'{side}Team'], 'teams')
+        todayStarters_expanded[f'{side}_Pitcher_RAPF_L{NRFIForm.FORM_WINDOW}'] = pitcher_form['LastN']
+        todayStarters_expanded[f'{side}_Pitcher_RAPF_EW'] = pitcher_form['EW']
+        todayStarters_expanded[f'{side}_Team_RSPF_L{NRFIForm.FORM_WINDOW}'] = team_form['LastN']
+        todayStarters_expanded[f'{side}_Team_RSPF_EW'] = team_form['EW']
+
     probStarters = todayStarters_expanded[[ \
         'HomeTeam', 'AwayTeam', 'HomePitcher', 'AwayPitcher', \
-        'Home_Pitcher_RAPF', 'Away_Pitcher_RAPF', 'Home_Team_RSPF', 'Away_Team_RSPF']]
-
-    #More price calculations
-    def calcPrice(x):
-        if pd.isna(x):
-            return np.nan
-        #nrfi chance > 0.5
-        elif x > 0.5:
-            price = int(round(((x/(1-x))*100)*-1,0))
-            return(price)
-        #nrfi chance < 0.5, but not 0
-        elif x < 0.5 and x > 0:
-            price = int(round((((1-x)/x)*100),0))
-            return("+"+str(price))
-        elif x == 0.5:
-            return("+100")
-        else:
-            return np.nan
+        'Home_Pitcher_RAPF', 'Away_Pitcher_RAPF', 'Home_Team_RSPF', 'Away_Team_RSPF']].copy()
 
-    def getNRFIPrice(nrfiTable, appendPrice_):
-        #if I decide I do not want to append the NRFI price, skip function
-        if appendPrice_ == False:
-            return nrfiTable
-        
-        else:
-            #get expected runs in the first inning based off of the 4 factors:
-            ##away pitcher RAPF, home pitcher RAPF, away team RPF, home team RPF averaged
-            ###subtract 1 to get expected prob for no runs
-            expectedNRFIProb = []
-            for game in range(nrfiTable.shape[0]):
-                expectedNRFIProb.append(1 - ((nrfiTable.iloc[game,4] + nrfiTable.iloc[game,5] + \
-                                            nrfiTable.iloc[game,6] + nrfiTable.iloc[game,7])/4))
-            print(f"expectedNRFIProb: {expectedNRFIProb}")
-
-            #convert each NRFI prob into american odds (think moneyline value)
-            nrfiPrice = []
-            for x in expectedNRFIProb:
-                nrfiPrice.append(calcPrice(x))
-            print(nrfiPrice)
-            #add YRFI price to table as well
-            # yrfiPrice = []
-            # for y in expectedNRFIProb:
-            #     yrfiPrice.append(calcPrice(1-y))
-
-            #SORT -- convert each NRFI prob into american odds (think moneyline value)
-            nrfiPriceSort = []
-            for x in expectedNRFIProb:
-                nrfiPriceSort.append(sortablePrice(x))
-            print(nrfiPriceSort)
-
-            #append prices to final prediction output
-            nrfiTable["NRFIPrice"] = nrfiPrice
-            nrfiTable["Sort_Price"] = nrfiPriceSort
-            #nrfiTable["YRFIPrice"] = yrfiPrice
-            return nrfiTable
-        
     #Get price for today's games
     probStarters = getNRFIPrice(probStarters, appendPrice_=True)
 
     #predict NRFI? for probable matchups
-    #print(best_dt_classifier[-1].decision_path(probStarters[0:]))
-    probStarters["SSS_ML_Prediction"] = best_dt_classifier[-1].predict(probStarters[['Home_Pitcher_RAPF',
-        'Away_Pitcher_RAPF',
-        'Home_Team_RSPF',
-        'Away_Team_RSPF']])
+    #print(best_dt_classifier.decision_path(probStarters[0:]))
+    probStarters["SSS_ML_Prediction"] = best_dt_classifier.predict(todayStarters_expanded[nrfi_model['feature_names']])
     probStarters["SSS_ML_Prediction"] = probStarters["SSS_ML_Prediction"].apply(lambda x: "NRFI" if x == 1 else "YRFI")
-    
+
     #Make a decision based off price and ML
     decisionmatrix = []
     for i in range(probStarters.shape[0]):
@@ -560,6 +275,70 @@ def app():
             decisionmatrix.append("No Bet")
     probStarters["SSS_Decision"] = decisionmatrix
 
+    return {
+        'date': slate_date(),
+        'generated_at': datetime.now(SLATE_TZ).isoformat(timespec='seconds'),
+        'probStarters': probStarters,
+        'history': nrfi_history,
+        'sweep': nrfi_sweep,
+        'importances': importances,
+    }
+
+############################################
+# Slate artifact
+############################################
+
+def saveSlate(slate, path=SLATE_PATH):
+    payload = {
+        'date': slate['date'],
+        'generated_at': slate['generated_at'],
+        'history': slate['history'],
+        # to_json writes NaN as null (plain json.dump would write invalid NaN tokens)
+        'probStarters': json.loads(slate['probStarters'].to_json(orient='records')),
+        'sweep': json.loads(slate['sweep'].to_json(orient='records')),
+        'importances': slate['importances'],
+    }
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(payload, f, indent=1)
+    os.replace(tmp_path, path)
+
+def loadSlate(path=SLATE_PATH, date=None):
+    """
+    Returns
+    - the saved slate dict, or None when it is missing, unreadable or not from today
+    """
+    try:
+        with open(path) as f:
+            payload = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if payload.get('date') != (date or slate_date()):
+        return None
+    payload['probStarters'] = pd.DataFrame(payload['probStarters'])
+    payload['sweep'] = pd.DataFrame(payload['sweep'])
+    payload['history'] = {k: (np.nan if v is None else v) for k, v in payload['history'].items()}
+    payload.setdefault('importances', {})  # slates saved before importances were kept
+    return payload
+
+def app():
+
+    st.title("💸 No Runs In The First Inning (NRFI) Model")
+    st.markdown("Analytically predict if a run will score in the first inning of today's baseball games.")
+    st.markdown("Explanation of the table and model below!")
+
+    # render the nightly slate; only rerun the pipeline when it is missing or stale
+    slate = loadSlate()
+    if slate is None:
+        slate = buildSlate()
+        try:
+            saveSlate(slate)
+        except OSError:
+            pass  # read-only deploys rebuild on the next view
+    probStarters = slate['probStarters']
+    nrfi_history = slate['history']
+    nrfi_sweep = slate['sweep']
+
     # Style Table
     def color_rows(row):
             if row["SSS_Decision"] == "NRFI":
@@ -571,6 +350,7 @@ def app():
             return [""] * len(row)
 
     st.dataframe(probStarters.style.apply(color_rows, axis=1))
+    st.caption(f"Slate generated {slate['generated_at']}")
 
     # table interpretation
     st.markdown("**How to interpret the NRFI table:**")
@@ -582,4 +362,10 @@ def app():
     st.markdown("**SSS Decision**")
     st.markdown("NRFI: Expected price is NRFI favored + Model predicts NRFI")
     st.markdown("YRFI: Expected price is YRFI favored + Model predicts YRFI")
-    st.markdown("No Bet: Expected price and model prediction do not align.")
\ No newline at end of file
+    st.markdown("No Bet: Expected price and model prediction do not align.")
+
+    # historical results
+    with st.expander("Historical results"):
+        st.markdown(f"**NRFI Price hit rate:** {nrfi_history['HitRate'] * 100:.1f}% over {nrfi_history['Games']} games")
+        st.markdown(f"Bet NRFI when NRFI Prob is at least the threshold, YRFI when it is below 1 - threshold, every bet at {NRFIEvaluation.MARKET_ODDS}.")
+        st.dataframe(nrfi_sweep.style.format({'HitRate': '{:.1%}', 'ROI': '{:.1%}', 'FairPrice': '{:.0f}', 'Profit': '{:.2f}'}), hide_index=True)
@@ -0,0 +1,98 @@
+import glob
+import hashlib
+import json
+import os
+import pickle
+from datetime import datetime
+
+import pandas as pd
+import sklearn
+import sklearn.model_selection as model_selection
+import sklearn.tree as tree
+import sklearn.metrics as metrics
+
+##################################################
+# On-disk cache for the trained NRFI decision tree
+# One artifact per data version, keyed by a hash of the training data + config
+##################################################
+
+MODEL_DIR = r'data/nrfi_model'
+
+MODEL_CONFIG = {
+    'estimator': 'DecisionTreeClassifier',
+    'split_ratios': [0.2, 0.3, 0.4],
+    'random_state': 42,
+    # bump to invalidate every cached artifact after a training change
+    'version': 1,
+}
+
+def data_hash(X, y, config=MODEL_CONFIG):
+    """
+    Content hash of the training features, labels and model config. The
+    scikit-learn version is included so an upgrade never loads an old pickle.
+    """
+    h = hashlib.sha256()
+    h.update(json.dumps(list(X.columns)).encode())
+    h.update(pd.util.hash_pandas_object(X, index=False).values.tobytes())
+    h.update(pd.util.hash_pandas_object(y, index=False).values.tobytes())
+    h.update(json.dumps(config, sort_keys=True).encode())
+    h.update(sklearn.__version__.encode())
+    return h.hexdigest()[:16]
+
+def train_model(X, y, config=MODEL_CONFIG):
+    """
+    Fit one tree per split ratio and keep the most accurate one.
+
+    Returns
+    - artifact dict with the model, feature names and split metadata
+    """
+    best = None
+    for sr in config['split_ratios']:
+        X_train, X_test, y_train, y_test = model_selection.train_test_split(
+            X, y, test_size=sr, random_state=config['random_state'])
+        # Decision Tree
+        dt_classifier = tree.DecisionTreeClassifier(random_state=config['random_state'])
+        dt_classifier.fit(X_train, y_train)
+        accuracy = metrics.accuracy_score(y_test, dt_classifier.predict(X_test))
+
+        #keep the first split ratio that reaches the best accuracy
+        if best is None or accuracy > best['accuracy']:
+            best = {
+                'model': dt_classifier,
+                'feature_names': list(X.columns),
+                'split_ratio': sr,
+                'accuracy': accuracy,
+                'train_shape': X_train.shape,
+                'test_shape': X_test.shape,
+            }
+    return best
+
+def _artifact_path(key, model_dir=MODEL_DIR):
+    return os.path.join(model_dir, f'nrfi_tree_{key}.pkl')
+
+def load_or_train(X, y, config=MODEL_CONFIG, model_dir=MODEL_DIR):
+    """
+    Load the cached model for this data version, training and saving it on a miss.
+    Saving a new artifact evicts every other (stale) artifact in model_dir.
+    """
+    key = data_hash(X, y, config)
+    path = _artifact_path(key, model_dir)
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+
+    artifact = train_model(X, y, config)
+    artifact['data_hash'] = key
+    artifact['trained_at'] = datetime.now().isoformat(timespec='seconds')
+    try:
+        os.makedirs(model_dir, exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(artifact, f)
+        os.replace(tmp_path, path)
+        for stale in glob.glob(_artifact_path('*', model_dir)):
+            if stale != path:
+                os.remove(stale)
+    except OSError:
+        pass  # read-only deploys just retrain on the next view
+    return artifact
@@ -0,0 +1,227 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from . import NRFIFeatures
+from . import NRFIForm
+
+##################################################
+# Persisted NRFI accumulator state
+# Team games/runs, pitcher appearances/runs given up and recent-form trackers
+# as of the last processed game, so a refresh only folds in games newer than
+# the checkpoint.
+##################################################
+
+STATE_PATH = r'data/nrfi_state.json'
+
+# what the totals are built from; a change to any of these for a processed
+# game (e.g. a corrected score) invalidates the state
+HASH_COLS = ['game_pk', 'home_team', 'away_team', 'HomePitcherID', 'AwayPitcherID', 'home_score', 'away_score']
+
+def empty_state():
+    return {
+        'team_games': {},
+        'team_runs': {},
+        'pitcher_apps': {},
+        'pitcher_runs': {},
+        'last_game_pk': None,
+        'last_date': None,
+        # games_hash of the processed games
+        'games_hash': None,
+        # last-N / EW trackers (NRFIForm), serialized
+        'form': NRFIForm.form_to_json(NRFIForm.empty_form()),
+        # pre-game features of every processed game, stored column-wise
+        'features': {col: [] for col in ['game_pk'] + NRFIForm.MODEL_COLS}
+    }
+
+def load_state(path=STATE_PATH):
+    """
+    Load the accumulator state from disk. Returns an empty state if the file
+    does not exist yet.
+    """
+    if not os.path.exists(path):
+        return empty_state()
+    with open(path, 'r') as f:
+        state = json.load(f)
+    # JSON object keys are always strings; pitcher ids are ints
+    state['pitcher_apps'] = {int(k): v for k, v in state['pitcher_apps'].items()}
+    state['pitcher_runs'] = {int(k): v for k, v in state['pitcher_runs'].items()}
+    return state
+
+def save_state(state, path=STATE_PATH):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
+
+def _last_date(games):
+    if 'game_date' not in games.columns or games.empty:
+        return None
+    return str(pd.to_datetime(games['game_date']).max().date())
+
+def _order_key(game_date, game_pk):
+    # position in NRFIFeatures.GAME_ORDER; undated games sort last, as in sort_values
+    game_date = pd.Timestamp(game_date)
+    return (pd.isna(game_date), game_date.date() if not pd.isna(game_date) else None, int(game_pk))
+
+def games_hash(games):
+    """
+    Fingerprint of the games' teams, pitchers and scores, independent of row order.
+    """
+    rows = games[HASH_COLS].sort_values('game_pk').astype(
+        {'game_pk': 'int64', 'home_team': str, 'away_team': str, 'HomePitcherID': 'int64',
+         'AwayPitcherID': 'int64', 'home_score': 'int64', 'away_score': 'int64'})
+    return hashlib.sha256(rows.to_csv(index=False).encode()).hexdigest()
+
+def rebuild_state(games):
+    """
+    Full rebuild: replay every game from zeroed totals with the vectorized engine.
+    """
+    state = empty_state()
+    teamsdf = pd.DataFrame({'Team': pd.unique(pd.concat([games['home_team'], games['away_team']]).astype(str))})
+    pitchers = pd.DataFrame({'pitcher': pd.unique(pd.concat([games['HomePitcherID'], games['AwayPitcherID']]))})
+    updated_games, updated_teamsdf, updated_pitchers = NRFIFeatures.update_database_vectorized(games, teamsdf, pitchers)
+
+    state['team_games'] = {str(t): int(g) for t, g in zip(updated_teamsdf['Team'], updated_teamsdf['Games'])}
+    state['team_runs'] = {str(t): int(r) for t, r in zip(updated_teamsdf['Team'], updated_teamsdf['RunsScored'])}
+    state['pitcher_apps'] = {int(p): int(a) for p, a in zip(updated_pitchers['pitcher'], updated_pitchers['Appearances'])}
+    state['pitcher_runs'] = {int(p): int(r) for p, r in zip(updated_pitchers['pitcher'], updated_pitchers['RunsGivenUp'])}
+    form_features, form = NRFIForm.form_features(updated_games)
+    updated_games = updated_games.merge(form_features, on='game_pk', how='left')
+    state['form'] = NRFIForm.form_to_json(form)
+    state['features'] = {col: updated_games[col].tolist() for col in state['features']}
+    state['features']['game_pk'] = [int(pk) for pk in state['features']['game_pk']]
+    if not updated_games.empty:
+        # updated_games is in GAME_ORDER, so the last row is the checkpoint
+        state['last_game_pk'] = int(updated_games['game_pk'].iloc[-1])
+    state['last_date'] = _last_date(updated_games)
+    state['games_hash'] = games_hash(games)
+    return state
+
+def refresh_state(state, games):
+    """
+    Fold games that are not in the state yet into the accumulators.
+
+    Games are processed in NRFIFeatures.GAME_ORDER, same as the full replay. If
+    a new game sorts before the checkpoint (e.g. a late-arriving game from an
+    earlier day), or the state holds games that are no longer in the dataset
+    (e.g. a new season), the incremental order no longer matches a replay, so
+    fall back to a rebuild.
+    The same goes for a processed game whose teams, pitchers or scores were
+    corrected since, detected by comparing games_hash of the processed games.
+
+    Returns
+    - (state, number of games folded in)
+    """
+    # states saved before the form features existed need a full replay
+    if 'form' not in state or not set(NRFIForm.MODEL_COLS).issubset(state['features']):
+        return rebuild_state(games), len(games)
+    seen = set(state['features']['game_pk'])
+    if not seen.issubset(games['game_pk'].tolist()):
+        return rebuild_state(games), len(games)
+    if state.get('games_hash') != games_hash(games[games['game_pk'].isin(seen)]):
+        return rebuild_state(games), len(games)
+    new_games = games[~games['game_pk'].isin(seen)].sort_values(NRFIFeatures.GAME_ORDER, kind='stable')
+    if new_games.empty:
+        return state, 0
+    first = new_games.iloc[0]
+    if state['last_game_pk'] is not None and \
+            _order_key(first['game_date'], first['game_pk']) < _order_key(state['last_date'], state['last_game_pk']):
+        return rebuild_state(games), len(games)
+
+    team_games = state['team_games']
+    team_runs = state['team_runs']
+    pitcher_apps = state['pitcher_apps']
+    pitcher_runs = state['pitcher_runs']
+    features = state['features']
+    form = NRFIForm.form_from_json(state['form'])
+
+    for game in new_games.itertuples(index=False):
+        home_team, away_team = str(game.home_team), str(game.away_team)
+        home_pitcher, away_pitcher = int(game.HomePitcherID), int(game.AwayPitcherID)
+        home_score, away_score = int(game.home_score), int(game.away_score)
+
+        hg, hr = team_games.get(home_team, 0), team_runs.get(home_team, 0)
+        ag, ar = team_games.get(away_team, 0), team_runs.get(away_team, 0)
+        hap, hrg = pitcher_apps.get(home_pitcher, 0), pitcher_runs.get(home_pitcher, 0)
+        aap, arg = pitcher_apps.get(away_pitcher, 0), pitcher_runs.get(away_pitcher, 0)
+
+        features['game_pk'].append(int(game.game_pk))
+        features['Home_Pitcher_RAPF'].append(hrg / hap if hap > 0 else 0.0)
+        features['Away_Pitcher_RAPF'].append(arg / aap if aap > 0 else 0.0)
+        features['Home_Team_RSPF'].append(hr / hg if hg > 0 else 0.0)
+        features['Away_Team_RSPF'].append(ar / ag if ag > 0 else 0.0)
+        recent = NRFIForm.add_game(form, home_team, away_team, home_pitcher, away_pitcher, home_score, away_score)
+        for col, value in zip(NRFIForm.FORM_COLS, recent):
+            features[col].append(float(value))
+
+        team_games[home_team] = hg + 1
+        team_runs[home_team] = hr + home_score
+        team_games[away_team] = ag + 1
+        team_runs[away_team] = ar + away_score
+        pitcher_apps[home_pitcher] = hap + 1
+        pitcher_runs[home_pitcher] = hrg + away_score
+        pitcher_apps[away_pitcher] = aap + 1
+        pitcher_runs[away_pitcher] = arg + home_score
+
+    state['form'] = NRFIForm.form_to_json(form)
+    state['last_game_pk'] = int(new_games['game_pk'].iloc[-1])
+    state['last_date'] = _last_date(new_games) or state['last_date']
+    state['games_hash'] = games_hash(games)
+    return state, len(new_games)
+
+def check_state(state, games):
+    """
+    Consistency check against a from-scratch replay of the same games.
+
+    Returns
+    - list of human-readable mismatches (empty when the state is consistent)
+    """
+    fresh = rebuild_state(games)
+    problems = []
+    for key in ['team_games', 'team_runs', 'pitcher_apps', 'pitcher_runs']:
+        diff = {k for k in set(state[key]) | set(fresh[key]) if state[key].get(k, 0) != fresh[key].get(k, 0)}
+        if diff:
+            problems.append(f"{key}: {len(diff)} mismatched entries")
+    ours = pd.DataFrame(state['features']).sort_values('game_pk').reset_index(drop=True)
+    theirs = pd.DataFrame(fresh['features']).sort_values('game_pk').reset_index(drop=True)
+    if len(ours) != len(theirs) or not ours['game_pk'].equals(theirs['game_pk']):
+        problems.append(f"features: {len(ours)} games stored, {len(theirs)} in replay")
+    elif not np.allclose(ours[NRFIForm.MODEL_COLS], theirs[NRFIForm.MODEL_COLS]):
+        problems.append("features: pre-game rates differ from replay")
+    return problems
+
+def state_frames(state, games, teamsdf, pitchers):
+    """
+    Same outputs as NRFIFeatures.update_database_vectorized, read from the state.
+
+    Returns
+    - updated_games, updated_teamsdf, updated_pitchers
+    """
+    features = pd.DataFrame(state['features'])
+    updated_games = games.drop(columns=NRFIForm.MODEL_COLS, errors='ignore') \
+        .merge(features, on='game_pk', how='inner') \
+        .sort_values(NRFIFeatures.GAME_ORDER, kind='stable').reset_index(drop=True)
+
+    updated_teamsdf = teamsdf.copy()
+    updated_teamsdf['Games'] = updated_teamsdf['Team'].map(state['team_games']).fillna(0).astype(int)
+    updated_teamsdf['RunsScored'] = updated_teamsdf['Team'].map(state['team_runs']).fillna(0).astype(int)
+    games_ = updated_teamsdf['Games']
+    updated_teamsdf['Team_RSPF'] = np.where(games_ > 0, updated_teamsdf['RunsScored'] / games_.where(games_ > 0, 1), 0.0)
+
+    updated_pitchers = pitchers.copy()
+    updated_pitchers['Appearances'] = updated_pitchers['pitcher'].map(state['pitcher_apps']).fillna(0).astype(int)
+    updated_pitchers['RunsGivenUp'] = updated_pitchers['pitcher'].map(state['pitcher_runs']).fillna(0).astype(int)
+    apps = updated_pitchers['Appearances']
+    updated_pitchers['Pitcher_RAPF'] = np.where(apps > 0, updated_pitchers['RunsGivenUp'] / apps.where(apps > 0, 1), 0.0)
+
+    return updated_games, updated_teamsdf, updated_pitchers
+
+def state_form(state):
+    """
+    Recent-form trackers after the last processed game (for today's starters).
+    """
+    return NRFIForm.form_from_json(state['form'])
@@ -0,0 +1,107 @@
+import numpy as np
+import pandas as pd
+
+##################################################
+# Odds / probability conversions
+# Every function takes a scalar, list, numpy array or pandas Series and
+# returns the same shape (a Series keeps its index). Anything that cannot be
+# priced (NaN, p <= 0, p >= 1, odds of 0) comes back as NaN.
+##################################################
+
+def _as_array(x):
+    return np.asarray(x, dtype=float)
+
+def _wrap(values, like):
+    # give back the caller's container type
+    if isinstance(like, pd.Series):
+        return pd.Series(values, index=like.index, name=like.name)
+    if np.ndim(values) == 0:
+        return values.item() if hasattr(values, 'item') else values
+    return values
+
+def prob_to_american(p):
+    """
+    Win probability (0-1) -> American odds, rounded to whole numbers.
+    Favorites (p > 0.5) are negative, underdogs positive, 0.5 is +100.
+    Example: 0.20 -> 400, 0.75 -> -300
+    """
+    arr = _as_array(p)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        valid = (arr > 0) & (arr < 1)
+        odds = np.where(arr > 0.5, -100 * arr / (1 - arr), 100 * (1 - arr) / arr)
+        odds = np.where(valid, np.round(odds), np.nan)
+    return _wrap(odds, p)
+
+def american_to_prob(odds):
+    """
+    American odds -> implied probability (still including the book's vig).
+    Example: -110 -> 0.5238, +150 -> 0.40
+    """
+    arr = _as_array(odds)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        prob = np.where(arr < 0, -arr / (-arr + 100), 100 / (arr + 100))
+        prob = np.where(np.abs(arr) >= 100, prob, np.nan)
+    return _wrap(prob, odds)
+
+def american_to_decimal(odds):
+    """
+    American odds -> decimal odds (total return per 1 unit staked).
+    Example: -200 -> 1.5, +150 -> 2.5
+    """
+    arr = _as_array(odds)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        dec = np.where(arr < 0, 1 + 100 / -arr, 1 + arr / 100)
+        dec = np.where(np.abs(arr) >= 100, dec, np.nan)
+    return _wrap(dec, odds)
+
+def decimal_to_american(dec):
+    """
+    Decimal odds -> American odds, rounded to whole numbers.
+    Example: 1.5 -> -200, 2.5 -> 150, 2.0 -> 100
+    """
+    arr = _as_array(dec)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        odds = np.where(arr >= 2, (arr - 1) * 100, -100 / (arr - 1))
+        odds = np.where(arr > 1, np.round(odds), np.nan)
+    return _wrap(odds, dec)
+
+def prob_to_decimal(p):
+    arr = _as_array(p)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        dec = np.where((arr > 0) & (arr <= 1), 1 / arr, np.nan)
+    return _wrap(dec, p)
+
+def remove_vig(*implied):
+    """
+    Normalize the implied probabilities of every side of a market so they sum to 1.
+    Example: remove_vig(american_to_prob(-110), american_to_prob(-110)) -> (0.5, 0.5)
+    """
+    arrays = [_as_array(p) for p in implied]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        total = np.sum(arrays, axis=0)
+        fair = [np.where(total > 0, a / total, np.nan) for a in arrays]
+    return tuple(_wrap(f, p) for f, p in zip(fair, implied))
+
+def payout(stake, odds):
+    """
+    Profit (not including the stake) of a winning bet at American odds.
+    Example: payout(10, +150) -> 15.0, payout(10, -200) -> 5.0
+    """
+    stake_arr = _as_array(stake)
+    arr = _as_array(odds)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        profit = np.where(arr > 0, stake_arr * arr / 100, stake_arr * 100 / np.abs(arr))
+        profit = np.where(np.abs(arr) >= 100, profit, np.nan)
+    return _wrap(profit, odds if isinstance(odds, pd.Series) else stake)
+
+def format_american(odds):
+    """
+    American odds -> display string with an explicit sign for underdogs.
+    Example: 150 -> "+150", -120 -> "-120"; NaN stays NaN
+    """
+    arr = np.atleast_1d(_as_array(odds))
+    valid = ~np.isnan(arr)
+    whole = np.where(valid, arr, 0).astype(np.int64)
+    text = np.char.add(np.where(whole > 0, '+', ''), whole.astype(str)).astype(object)
+    text[~valid] = np.nan
+    return _wrap(text.reshape(np.shape(odds)), odds)
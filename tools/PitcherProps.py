@@ -8,10 +8,11 @@ import pybaseball as pyb
 import statsapi
 from scipy.stats import rankdata
 from datetime import datetime
-import unicodedata
 import os
 import openpyxl
 from openpyxl.utils.dataframe import dataframe_to_rows
+
+from . import PlayerIds
 ##################################################
 
 #initialize pitcher prop page
@@ -83,7 +84,10 @@ def app():
         pitch = pyb.pitching_stats(2025, qual=10)
         st.markdown(f"After {useNextSeason}, the data used for these models will reflect 2026. Currently using 2025 data.")
 
-    #get relevant columns
+    #get relevant columns (Fangraphs' own MLBAM id when it sends one, else mapped from IDfg)
+    pitch_ids = PlayerIds.fangraphs_to_mlbam(pitch['IDfg'])
+    if 'xMLBAMID' in pitch.columns:
+        pitch_ids = pitch['xMLBAMID'].astype('Int64').fillna(pitch_ids)
     pitch = pitch[['Name', 'IP', 'G', 'TBF', 'BB%', 'K%', 'SwStr%', 'Swing%', 'Balls', 'Pitches', \
         'HR/9', 'HardHit%', 'FB%']]
     #change IP to Outs/G (Outs / GS)
@@ -131,14 +135,20 @@ def app():
     pitchers_df = pd.DataFrame(pitchers, columns=['Pitcher', 'Team', 'Opponent'])
     pitchers_df['Team'] = mapTeamInitials(pitchers_df['Team'])
     pitchers_df['Opponent'] = mapTeamInitials(pitchers_df['Opponent'])
-    def remove_accents(input_str):
-        if isinstance(input_str, str):
-            nfkd_form = unicodedata.normalize('NFKD', input_str)
-            return "".join([c for c in nfkd_form if not unicodedata.combining(c)])
-        return input_str
-    pitchers_df['Pitcher'] = pitchers_df['Pitcher'].apply(remove_accents)
-    daily_df = pd.merge(pitchers_df, pitch_percentile, left_on='Pitcher', right_on='Name', how='left')
+    #join probable pitchers to Fangraphs stats on MLBAM id, by name where an id does not resolve
+    pitchers_df['MLBAMID'] = PlayerIds.resolve_ids(pitchers_df['Pitcher'], pitchers_df['Team'])
+    rows, by_name = PlayerIds.match_players(pitchers_df['MLBAMID'], pitchers_df['Pitcher'],
+                                            pitch_ids, pitch_percentile['Name'])
+    daily_df = pd.concat([pitchers_df.reset_index(drop=True),
+                          pitch_percentile.reset_index(drop=True).reindex(rows).reset_index(drop=True)], axis=1)
+    announced = pitchers_df['Pitcher'].astype(bool).to_numpy()
+    unmatched = daily_df.loc[announced & rows.isna().to_numpy(), 'Pitcher'].tolist()
+    print(f"Probable starters: {int(announced.sum())} announced, {int(pitchers_df['MLBAMID'][announced].isna().sum())} "
+          f"without an MLBAM id, {by_name} matched by name, {len(unmatched)} without Fangraphs stats")
+    if unmatched:
+        st.caption(f"No Fangraphs stats for {len(unmatched)} probable starters: {', '.join(unmatched)}")
     del daily_df['Name']
+    del daily_df['MLBAMID']
     daily_df_2 = pd.merge(daily_df, tbat_pctile, left_on='Opponent', right_on='Team', how='left')
     del daily_df_2['Team_y']
     daily_df_2.rename(columns={'Team_x': 'PitcherTeam'}, inplace=True)
@@ -0,0 +1,147 @@
+import unicodedata
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+import regex as re
+
+##################################################
+# Player identity resolution
+# data/mlbam_ids.csv loaded once into a normalized-name -> MLBAM id index
+##################################################
+
+PLAYER_IDS_PATH = r'data/mlbam_ids.csv'
+
+# Team code spellings used by the different sources, mapped onto mlbam_ids.csv
+TEAM_ALIASES = {'AZ': 'ARI', 'CWS': 'CHW', 'KCR': 'KC', 'SDP': 'SD', 'SFG': 'SF',
+                'TBR': 'TB', 'WSN': 'WSH', 'OAK': 'ATH'}
+
+_last_first_re = re.compile(r'^\s*([^,]+),\s*(.+?)\s*$')
+_punct_re = re.compile(r"[.'’‘`]")
+_space_re = re.compile(r'[\s\-]+')
+_suffix_re = re.compile(r'\s+(jr|sr|ii|iii|iv)$')
+
+def normalize_name(name):
+    """
+    Key used for every name lookup: "Last, First" flipped, accents and
+    punctuation stripped, lower case, single spaces.
+    Example: "Ureña, José" -> "jose urena", "Travis d’Arnaud" -> "travis darnaud"
+    """
+    if not isinstance(name, str):
+        return None
+    match = _last_first_re.match(name)
+    if match:
+        name = f"{match.group(2)} {match.group(1)}"
+    name = unicodedata.normalize('NFKD', name)
+    name = ''.join(c for c in name if not unicodedata.combining(c))
+    name = _punct_re.sub('', name.lower())
+    return _space_re.sub(' ', name).strip()
+
+def _aliases(key):
+    # also index the name without a generational suffix ("bobby witt jr" -> "bobby witt")
+    stripped = _suffix_re.sub('', key)
+    return {key, stripped} if stripped else {key}
+
+@lru_cache(maxsize=1)
+def load_players(path=PLAYER_IDS_PATH):
+    return pd.read_csv(path, encoding='utf-8-sig')
+
+@lru_cache(maxsize=1)
+def load_index(path=PLAYER_IDS_PATH):
+    """
+    Returns
+    - name_index: normalized name -> MLBAM id (None when the name is ambiguous)
+    - team_index: (normalized name, team) -> MLBAM id
+    - fangraphs_index: FanGraphs id -> MLBAM id
+    """
+    players = load_players(path)
+    name_ids = {}
+    team_index = {}
+    for row in players.itertuples(index=False):
+        mlbam = int(row.MLBAMID)
+        keys = set()
+        for raw in (row.Name, row.YahooName, f"{row.First} {row.Last}", f"{row.Firstv2} {row.Lastv2}"):
+            key = normalize_name(raw)
+            if key:
+                keys |= _aliases(key)
+        for key in keys:
+            name_ids.setdefault(key, set()).add(mlbam)
+            if isinstance(row.Team, str):
+                team_index[(key, row.Team)] = mlbam
+    name_index = {k: (ids.pop() if len(ids) == 1 else None) for k, ids in name_ids.items()}
+
+    fangraphs = players.dropna(subset=['FanGraphsID'])
+    fangraphs_index = dict(zip(fangraphs['FanGraphsID'].astype(str), fangraphs['MLBAMID'].astype(int)))
+    return name_index, team_index, fangraphs_index
+
+def resolve_ids(names, teams=None):
+    """
+    Vectorized name -> MLBAM id lookup. Each distinct name is normalized once.
+    Names shared by several players only resolve when a team is given.
+
+    Parameters
+    - names: Series of player names (any of "First Last" / "Last, First", with or without accents)
+    - teams: optional Series of team codes aligned with names
+    Returns
+    - Int64 Series of MLBAM ids (<NA> when not found or ambiguous)
+    """
+    name_index, team_index, _ = load_index()
+    names = pd.Series(names)
+    uniques = pd.unique(names)
+    keys = dict(zip(uniques, [normalize_name(n) for n in uniques]))
+    normalized = names.map(keys)
+
+    ids = normalized.map(name_index)
+    if teams is not None:
+        teams = pd.Series(teams, index=names.index).replace(TEAM_ALIASES)
+        by_team = pd.Series([team_index.get(k) for k in zip(normalized, teams)], index=names.index, dtype='object')
+        ids = by_team.where(by_team.notna(), ids)
+    return ids.astype('Int64')
+
+def fangraphs_to_mlbam(fangraphs_ids):
+    _, _, fangraphs_index = load_index()
+    return pd.Series(fangraphs_ids).astype(str).map(fangraphs_index).astype('Int64')
+
+def match_players(ids, names, other_ids, other_names):
+    """
+    Row of another table for each player: joined on MLBAM id, falling back to
+    the normalized name where an id did not resolve on either side (players
+    missing from data/mlbam_ids.csv). Names shared by several rows of the other
+    table are not used for the fallback.
+
+    Returns
+    - Int64 Series of positions into the other table (<NA> when unmatched)
+      aligned with ids, and the number of players matched by name
+    """
+    ids, names = pd.Series(ids).reset_index(drop=True), pd.Series(names).reset_index(drop=True)
+    other_ids, other_keys = pd.Series(other_ids).reset_index(drop=True), pd.Series(other_names).map(normalize_name)
+
+    known = other_ids.dropna()
+    by_id = pd.Series(known.index, index=known.astype(int)).groupby(level=0).first()
+    by_name = pd.Series(other_keys.index, index=other_keys.reset_index(drop=True))
+    by_name = by_name[~by_name.index.duplicated(keep=False) & by_name.index.notna()]
+
+    positions = ids.map(by_id).astype('Int64')
+    fallback = names.map(normalize_name).map(by_name).astype('Int64')
+    by_name_rows = positions.isna() & fallback.notna()
+    return positions.fillna(fallback), int(by_name_rows.sum())
+
+@lru_cache(maxsize=1)
+def _search_table(path=PLAYER_IDS_PATH):
+    players = load_players(path).dropna(subset=['Name']).drop_duplicates('Name')
+    keys = np.array([normalize_name(n) for n in players['Name']], dtype=object)
+    return players['Name'].to_numpy(), keys, dict(zip(players['Name'], players['MLBAMID'].astype(int)))
+
+def search_names(query):
+    """
+    Display names whose normalized form contains the normalized query
+    (so "jose urena" finds "Jose Urena" and "Ureña" alike).
+    """
+    names, keys, _ = _search_table()
+    q = normalize_name(query) or ''
+    mask = pd.Series(keys).str.contains(q, regex=False).to_numpy()
+    return names[mask].tolist()
+
+def id_for_display_name(name):
+    _, _, ids = _search_table()
+    return ids.get(name)
@@ -0,0 +1,184 @@
+import argparse
+import time
+from collections import namedtuple
+
+import pandas as pd
+import regex as re
+import requests
+from bs4 import BeautifulSoup as bs
+from bs4 import SoupStrainer
+
+from . import Replay
+
+##################################################
+# Baseball Savant probable pitchers
+##################################################
+
+PROBABLE_PITCHERS_URL = "https://baseballsavant.mlb.com/probable-pitchers"
+
+# One record per pitcher slot; pitcher_id/pitcher_name are None when TBD.
+# game is the matchup's position on the page (keeps doubleheaders apart).
+ProbableStarter = namedtuple(
+    'ProbableStarter',
+    ['game', 'home_team', 'away_team', 'side', 'pitcher_id', 'pitcher_name', 'tbd']
+)
+
+TBD_TEXT = 'To be announced.'
+_matchup_re = re.compile(r'^\s*(.*?)\s+@\s+(.*?)\s*$')
+_player_id_re = re.compile(r'(\d+)(?:[/?#]|$)')
+
+# lxml is much faster than the pure-python parser when it is installed
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+def fetch_probable_starters_html(url=PROBABLE_PITCHERS_URL):
+    site = requests.get(url, timeout=10)
+    site.raise_for_status()
+    return site.content
+
+def parse_probable_starters(html):
+    """
+    Walk the page once, in document order, and emit a record for every pitcher slot.
+
+    Each h2 ("Away Team @ Home Team") opens a matchup; the slots that follow it
+    (a matchup-link anchor or a "To be announced." h3) belong to that matchup,
+    away starter first. A matchup with a missing slot therefore cannot shift the
+    pitchers of the games after it.
+
+    Returns
+    - list of ProbableStarter records
+    """
+    content = bs(html, HTML_PARSER, parse_only=SoupStrainer(['h2', 'h3', 'a']))
+    records = []
+    home_team = away_team = None
+    game = -1
+    slots = 0
+    for tag in content.find_all(['h2', 'h3', 'a']):
+        if tag.name == 'h2':
+            match = _matchup_re.match(tag.get_text())
+            home_team, away_team = (match.group(2), match.group(1)) if match else (None, None)
+            game += 1
+            slots = 0
+            continue
+        if home_team is None or slots >= 2:
+            continue
+
+        if tag.name == 'h3':
+            if tag.get_text(strip=True) != TBD_TEXT:
+                continue
+            pitcher_id, pitcher_name, tbd = None, None, True
+        elif 'matchup-link' in (tag.get('class') or []):
+            pitcher_name = tag.get_text(strip=True)
+            if not pitcher_name:
+                continue
+            id_match = _player_id_re.search(tag.get('href', ''))
+            pitcher_id, tbd = (int(id_match.group(1)) if id_match else None), False
+        else:
+            continue
+
+        records.append(ProbableStarter(game, home_team, away_team, 'Away' if slots == 0 else 'Home',
+                                       pitcher_id, pitcher_name, tbd))
+        slots += 1
+    return records
+
+def probable_starters_frame(records):
+    """
+    One row per matchup: HomePitcher, AwayPitcher, HomeTeam, AwayTeam (+ pitcher ids).
+    TBD starters keep the "TBD" name the NRFI table has always shown.
+    """
+    rows = {}
+    for r in records:
+        row = rows.setdefault(r.game, {
+            'HomePitcher': 'TBD', 'AwayPitcher': 'TBD',
+            'HomeTeam': r.home_team, 'AwayTeam': r.away_team,
+            'HomePitcherID': None, 'AwayPitcherID': None,
+        })
+        if not r.tbd:
+            row[f'{r.side}Pitcher'] = r.pitcher_name
+            row[f'{r.side}PitcherID'] = r.pitcher_id
+    matchupDF = pd.DataFrame(list(rows.values()), columns=[
+        'HomePitcher', 'AwayPitcher', 'HomeTeam', 'AwayTeam', 'HomePitcherID', 'AwayPitcherID'])
+    matchupDF[['HomePitcherID', 'AwayPitcherID']] = matchupDF[['HomePitcherID', 'AwayPitcherID']].astype('Int64')
+    return matchupDF
+
+##################################################
+# Parity check against the original scrape
+# The regexes NRFIModel ran over str(content) before this module, plus the
+# id from the '-<id>' end of each player slug, as (team, side, pitcher, id) rows
+##################################################
+
+# hand-built in the page's markup (8 games, 3 TBD slots); overwrite it with a real
+# page via --record FIXTURE_PATH
+FIXTURE_PATH = r'data/fixtures/probable-pitchers.html'
+
+def _legacy_rows(html):
+    content = bs(html, HTML_PARSER)
+    matchups = []
+    for m in [i.text for i in content.find_all('h2')]:
+        matchups.append(re.findall(r'(.*)\s@', m)[0])
+        matchups.append(re.findall(r'@\s(.*)', m)[0])
+
+    regex1 = r"<h3>(To be announced.)</h3>"
+    regex2 = r"<a class=\"matchup-link\".*>(.*)<"
+    players = []
+    for i in re.findall("|".join([regex1, regex2]), str(content)):
+        if i[0] == 'To be announced.':
+            players.append("TBD")
+        elif (i[1] != 'To be announced.') and (i[1] != ''):
+            players.append(i[1])
+    ids = iter(int(i) for i in re.findall(r'<a class="matchup-link" href="[^"?#]*?-(\d+)/?[?#"]', str(content)))
+
+    rows = []
+    for m0 in range(0, len(matchups), 2):
+        for side, team, player in [('Away', matchups[m0], players[m0]), ('Home', matchups[m0 + 1], players[m0 + 1])]:
+            rows.append((team, side, player, None if player == 'TBD' else next(ids)))
+    return rows
+
+def _rows(records):
+    return [(r.away_team if r.side == 'Away' else r.home_team, r.side,
+             'TBD' if r.tbd else r.pitcher_name, r.pitcher_id) for r in records]
+
+def check_parity(html):
+    """
+    Raise AssertionError listing the rows where parse_probable_starters and
+    the original scrape disagree.
+    """
+    legacy, new = _legacy_rows(html), _rows(parse_probable_starters(html))
+    diff = [(i, a, b) for i, (a, b) in enumerate(zip(legacy, new)) if a != b]
+    assert len(legacy) == len(new) and not diff, f"{len(legacy)} legacy vs {len(new)} new rows; differing: {diff}"
+    return new
+
+if __name__ == '__main__':
+    # Offline benchmark against saved pages:
+    #   python -m tools.ProbableStarters --record page.html   (save today's page)
+    #   python -m tools.ProbableStarters --check [page.html]  (old and new parsers agree; default FIXTURE_PATH)
+    #   python -m tools.ProbableStarters page.html [...]      (time and print the parse)
+    parser = argparse.ArgumentParser(description="Parse saved Baseball Savant probable-pitchers pages")
+    parser.add_argument('pages', nargs='*', help="saved pages to time and print")
+    parser.add_argument('--record', metavar='PATH', help="save today's page to PATH")
+    parser.add_argument('--check', action='store_true',
+                        help=f"check the old and new parsers agree on the pages (default {FIXTURE_PATH})")
+    args = parser.parse_args()
+
+    if args.record:
+        Replay.install()
+        with open(args.record, 'wb') as f:
+            f.write(fetch_probable_starters_html())
+    elif args.check:
+        for path in args.pages or [FIXTURE_PATH]:
+            with open(path, 'rb') as f:
+                rows = check_parity(f.read())
+            print(f"{path}: {len(rows)} slots match the original scrape")
+    else:
+        for path in args.pages:
+            with open(path, 'rb') as f:
+                html = f.read()
+            start = time.perf_counter()
+            records = parse_probable_starters(html)
+            elapsed = time.perf_counter() - start
+            print(f"{path}: {len(records)} slots, {len({r.game for r in records})} games "
+                  f"in {elapsed * 1000:.1f} ms ({HTML_PARSER})")
+            print(probable_starters_frame(records).to_string(index=False))
@@ -0,0 +1,186 @@
+import argparse
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+
+##################################################
+# Record / replay stand-in for the upstream services
+# A local HTTP server answers with captured responses (optionally recording
+# misses from the real service), with configurable latency and failures.
+# With REPLAY_URL set, entry points that call install() (the collector
+# scripts) send every requests call to a known host to it.
+##################################################
+
+# committed fixtures: ESPN NBA (2025-10-21) and MLB (2026-04-01) scoreboards,
+# Savant probable pitchers and the 2026-04-01 Statcast search, hand-built in
+# each service's format; replace them with real responses via --record
+REPLAY_DIR = r'data/replay'
+
+# hosts whose requests are redirected to the stand-in
+REPLAY_HOSTS = {
+    'site.api.espn.com',
+    'baseballsavant.mlb.com',
+    'statsapi.mlb.com',
+    'www.fangraphs.com',
+    'fangraphs.com',
+    'www.baseball-reference.com',
+}
+
+def original_request():
+    """
+    The unpatched requests.Session.request. install() keeps it on its wrapper
+    as __wrapped__, so this holds however often the stand-in was installed.
+    """
+    request = requests.Session.request
+    return getattr(request, '__wrapped__', request)
+
+def fixture_key(host, path, query=''):
+    # query parameters are sorted so the same request always maps to one fixture
+    canonical = f"{host}{path}?{urlencode(sorted(parse_qsl(query, keep_blank_values=True)))}"
+    return hashlib.sha256(canonical.encode()).hexdigest()[:24]
+
+def _fixture_paths(replay_dir, host, key):
+    base = os.path.join(replay_dir, host, key)
+    return base + '.json', base + '.body'
+
+def load_fixture(replay_dir, host, path, query=''):
+    """
+    Returns
+    - (status, content type, body bytes), or None when nothing was recorded
+    """
+    meta_path, body_path = _fixture_paths(replay_dir, host, fixture_key(host, path, query))
+    try:
+        with open(meta_path) as f:
+            meta = json.load(f)
+        with open(body_path, 'rb') as f:
+            return meta['status'], meta['content_type'], f.read()
+    except OSError:
+        return None
+
+def save_fixture(replay_dir, host, path, query, status, content_type, body):
+    meta_path, body_path = _fixture_paths(replay_dir, host, fixture_key(host, path, query))
+    os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+    with open(body_path, 'wb') as f:
+        f.write(body)
+    with open(meta_path, 'w') as f:
+        json.dump({'url': f"https://{host}{path}" + (f"?{query}" if query else ''),
+                   'status': status, 'content_type': content_type}, f, indent=1)
+
+def make_handler(replay_dir=REPLAY_DIR, latency=0.0, jitter=0.0, fail_rate=0.0, record=False, seed=0):
+    """
+    Request handler serving /<host>/<path>?<query> from replay_dir.
+
+    Parameters
+    - latency, jitter: every response waits latency + uniform(0, jitter) seconds
+    - fail_rate: share of requests answered with a 503 instead (seeded, reproducible)
+    - record: fetch misses from the real service and save them as fixtures
+    """
+    rng = random.Random(seed)
+    lock = threading.Lock()
+    session = requests.Session()
+
+    class ReplayHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, status, content_type, body):
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            url = urlsplit(self.path)
+            host, _, rest = url.path.lstrip('/').partition('/')
+            path = '/' + rest
+            with lock:
+                delay = latency + rng.uniform(0, jitter)
+                fail = rng.random() < fail_rate
+            time.sleep(delay)
+            if fail:
+                return self._send(503, 'text/plain', b'injected failure')
+
+            fixture = load_fixture(replay_dir, host, path, url.query)
+            if fixture is None and record and host in REPLAY_HOSTS:
+                upstream = f"https://{host}{path}" + (f"?{url.query}" if url.query else '')
+                try:
+                    # bypass the REPLAY_URL rewrite so recording never loops back here
+                    response = original_request()(session, 'GET', upstream, timeout=30)
+                    fixture = (response.status_code, response.headers.get('Content-Type', 'application/octet-stream'),
+                               response.content)
+                    save_fixture(replay_dir, host, path, url.query, *fixture)
+                except requests.RequestException as e:
+                    return self._send(502, 'text/plain', str(e).encode())
+            if fixture is None:
+                return self._send(404, 'text/plain', f"no fixture for {host}{path}?{url.query}".encode())
+            self._send(*fixture)
+
+    return ReplayHandler
+
+def serve(port=8765, background=False, **kwargs):
+    """
+    Start the stand-in on 127.0.0.1:port (0 picks a free port).
+
+    Returns
+    - the server; its address is server.server_address
+    """
+    server = ThreadingHTTPServer(('127.0.0.1', port), make_handler(**kwargs))
+    if background:
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+    else:
+        server.serve_forever()
+    return server
+
+def rewrite_url(url, replay_url):
+    parts = urlsplit(url)
+    if parts.netloc not in REPLAY_HOSTS:
+        return url
+    return f"{replay_url.rstrip('/')}/{parts.netloc}{parts.path}" + (f"?{parts.query}" if parts.query else '')
+
+def install(replay_url=None):
+    """
+    Route requests to REPLAY_HOSTS through the stand-in at replay_url (default:
+    the REPLAY_URL environment variable). Does nothing when neither is set.
+    """
+    replay_url = replay_url or os.environ.get('REPLAY_URL')
+    if not replay_url:
+        return False
+    original = original_request()
+
+    def request(self, method, url, *args, **kwargs):
+        return original(self, method, rewrite_url(url, replay_url), *args, **kwargs)
+
+    request.__wrapped__ = original
+    requests.Session.request = request
+    return True
+
+def uninstall():
+    requests.Session.request = original_request()
+
+if __name__ == '__main__':
+    # Serve captured responses (record them first against the real services):
+    #   python -m tools.Replay --record                      (capture while the tools run)
+    #   python -m tools.Replay --latency 0.05 --fail-rate 0.1
+    #   REPLAY_URL=http://127.0.0.1:8765 python nba-collect-data.py
+    parser = argparse.ArgumentParser(description="Record/replay stand-in for upstream sports APIs")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--dir', default=REPLAY_DIR, help="fixture directory")
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument('--jitter', type=float, default=0.0, help="extra random latency, up to this many seconds")
+    parser.add_argument('--fail-rate', type=float, default=0.0, help="share of requests answered with a 503")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--record', action='store_true', help="fetch and save responses that are not recorded yet")
+    args = parser.parse_args()
+    print(f"Replaying {args.dir} on http://127.0.0.1:{args.port}" + (" (recording misses)" if args.record else ''))
+    serve(args.port, replay_dir=args.dir, latency=args.latency, jitter=args.jitter,
+          fail_rate=args.fail_rate, record=args.record, seed=args.seed)
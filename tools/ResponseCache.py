@@ -0,0 +1,99 @@
+import gzip
+import hashlib
+import json
+import os
+import time
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+##################################################
+# On-disk cache of upstream API responses
+# gzip JSON entries keyed by sha256(endpoint + date). An entry fetched once its
+# date was over and the correction window had passed is final and never
+# refetched; anything else expires after a TTL.
+# The directory is not committed: the nightly workflows carry it between runs
+# with actions/cache, so finished dates are fetched once per season.
+##################################################
+
+CACHE_DIR = r'data/response_cache'
+
+# today's (or an undated) response is reused for this many seconds
+TODAY_TTL = 5 * 60
+
+# US schedules: a date is over once late West Coast games are final
+CACHE_TZ = ZoneInfo('America/New_York')
+FINAL_AFTER = timedelta(hours=6)  # after midnight ending the date
+# stat corrections land within a couple of days; until then a finished date is refetchable
+CORRECTION_WINDOW = timedelta(hours=48)
+
+def cache_key(endpoint, date=None):
+    return hashlib.sha256(f"{endpoint}|{date or ''}".encode()).hexdigest()
+
+def _path(key, cache_dir=CACHE_DIR):
+    # two-character fan-out keeps directories small over a season
+    return os.path.join(cache_dir, key[:2], f'{key}.json.gz')
+
+def _parse_date(date):
+    for fmt in ("%Y%m%d", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(str(date), fmt)
+        except ValueError:
+            pass
+    raise ValueError(f"unrecognized date {date!r}")
+
+def final_after(date):
+    """
+    Epoch seconds after which a response for the date can no longer change:
+    the date is over and its correction window has passed.
+    """
+    day = _parse_date(date).replace(tzinfo=CACHE_TZ)
+    return (day + timedelta(days=1) + FINAL_AFTER + CORRECTION_WINDOW).timestamp()
+
+def get(endpoint, date=None, ttl=TODAY_TTL, cache_dir=CACHE_DIR):
+    """
+    Returns
+    - the cached payload, or None when missing, unreadable or expired
+    """
+    try:
+        with gzip.open(_path(cache_key(endpoint, date), cache_dir), 'rt', encoding='utf-8') as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if entry.get('final') or time.time() - entry['fetched_at'] < ttl:
+        return entry['payload']
+    return None
+
+def put(endpoint, date, payload, cache_dir=CACHE_DIR):
+    """
+    Store a payload. It is marked final when fetched after its date was over.
+    """
+    fetched_at = time.time()
+    entry = {
+        'endpoint': endpoint,
+        'date': date,
+        'fetched_at': fetched_at,
+        'final': date is not None and fetched_at >= final_after(date),
+        'payload': payload,
+    }
+    path = _path(cache_key(endpoint, date), cache_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+        json.dump(entry, f)
+    os.replace(tmp_path, path)
+
+def cached_json(endpoint, date, fetch, ttl=TODAY_TTL, cache_dir=CACHE_DIR):
+    """
+    Read-through helper: return the cached payload or call fetch() and store
+    its result. Failing to write the cache (read-only deploys) is ignored.
+    """
+    payload = get(endpoint, date, ttl, cache_dir)
+    if payload is not None:
+        return payload
+    payload = fetch()
+    if payload is not None:
+        try:
+            put(endpoint, date, payload, cache_dir)
+        except OSError:
+            pass
+    return payload
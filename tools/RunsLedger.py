@@ -0,0 +1,113 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+##################################################
+# MLB runs-allowed ledger
+# Append-only (ESPN event id, date, team, runs allowed) rows for completed
+# games, and the Run Your Pool table (runs_given_up.csv) kept up to date from
+# the newly appended rows only
+##################################################
+
+LEDGER_PATH = r'data/mlb_runs_ledger.csv'
+RYP_PATH = r'data/runs_given_up.csv'
+# dates whose fetch failed, retried on the next run
+FAILED_DATES_PATH = r'data/mlb_failed_dates.json'
+
+LEDGER_COLUMNS = ['event_id', 'date', 'team', 'runs_allowed']
+LEDGER_KEY = ['event_id', 'team']
+
+MLB_TEAMS = ['KC', 'MIN', 'BAL', 'TEX', 'MIA', 'CHW', 'CIN', 'PIT', 'PHI', 'WSH', \
+'TOR', 'COL', 'ATL', 'ATH', 'CHC', 'LAA', 'MIL', 'TB', 'STL', 'NYM', \
+'HOU', 'BOS', 'SEA', 'NYY', 'SD', 'SF', 'LAD', 'CLE', 'ARI', 'DET']
+
+# the Run Your Pool squares: games allowing exactly 0..13 runs
+RUN_BINS = list(range(14))
+
+def ledger_frame(records):
+    ledger = pd.DataFrame(records, columns=LEDGER_COLUMNS)
+    return ledger.astype({'event_id': 'int64', 'date': 'str', 'team': 'str', 'runs_allowed': 'int64'})
+
+def load_ledger(path=LEDGER_PATH):
+    if not os.path.exists(path):
+        return ledger_frame([])
+    return ledger_frame(pd.read_csv(path, dtype={'date': str}))
+
+def save_ledger(ledger, path=LEDGER_PATH):
+    tmp_path = path + '.tmp'
+    ledger.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+def append_ledger(ledger, records):
+    """
+    Append rows whose (event id, team) is not in the ledger yet, so refetching
+    a day never counts a game twice.
+
+    Returns
+    - updated ledger, DataFrame of the rows that were actually new
+    """
+    new_rows = ledger_frame(records).drop_duplicates(LEDGER_KEY)
+    seen = pd.MultiIndex.from_frame(ledger[LEDGER_KEY])
+    new_rows = new_rows[~pd.MultiIndex.from_frame(new_rows[LEDGER_KEY]).isin(seen)]
+    if new_rows.empty:
+        return ledger, new_rows
+    ledger = pd.concat([ledger, new_rows], ignore_index=True).sort_values(['date', 'event_id', 'team'], kind='stable')
+    return ledger.reset_index(drop=True), new_rows.reset_index(drop=True)
+
+def _counts(rows):
+    # per team: games allowing each of 0..13 runs, plus every game in Games
+    counts = pd.crosstab(rows['team'], rows['runs_allowed'])
+    table = pd.DataFrame(0, index=MLB_TEAMS, columns=RUN_BINS + ['Games'])
+    bins = counts.reindex(index=MLB_TEAMS, columns=RUN_BINS, fill_value=0)
+    table[RUN_BINS] = bins.to_numpy()
+    table['Games'] = counts.sum(axis=1).reindex(MLB_TEAMS, fill_value=0).to_numpy()
+    return table
+
+def _with_matches(ryp):
+    # Add a column to count the number of matches for each team
+    ryp = ryp.astype(int)
+    ryp['Matches'] = (ryp[RUN_BINS] > 0).sum(axis=1)
+    return ryp
+
+def build_ryp(ledger):
+    """
+    Full rebuild of the Run Your Pool table from the whole ledger.
+    """
+    return _with_matches(_counts(ledger))
+
+def update_ryp(ryp, new_rows):
+    """
+    Add the new ledger rows to an existing Run Your Pool table.
+    """
+    ryp = ryp[RUN_BINS + ['Games']].reindex(MLB_TEAMS, fill_value=0)
+    return _with_matches(ryp + _counts(new_rows))
+
+def load_ryp(path=RYP_PATH):
+    """
+    Returns
+    - the saved Run Your Pool table (integer run columns), or None if missing
+    """
+    if not os.path.exists(path):
+        return None
+    ryp = pd.read_csv(path, index_col='Tm')
+    ryp.columns = [int(c) if c.isdigit() else c for c in ryp.columns]
+    return ryp
+
+def save_ryp(ryp, path=RYP_PATH):
+    tmp_path = path + '.tmp'
+    ryp.to_csv(tmp_path, index_label='Tm')
+    os.replace(tmp_path, path)
+
+def check_ryp(ryp, ledger, full=False):
+    """
+    True when the table holds the ledger's games: the game count by default
+    (O(teams)), every team's 0-13 counts recomputed from the whole ledger
+    when full is set (an occasional consistency check).
+    """
+    if ryp is None or not set(RUN_BINS + ['Games']).issubset(ryp.columns):
+        return False
+    if not full:
+        return bool(ryp['Games'].sum() == len(ledger))
+    expected = _counts(ledger)
+    return bool(np.array_equal(ryp.reindex(MLB_TEAMS)[RUN_BINS + ['Games']].to_numpy(), expected.to_numpy()))
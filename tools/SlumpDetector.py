@@ -6,26 +6,27 @@ import math
 import streamlit as st
 import altair as alt
 
+from . import PlayerIds
+
 def app():
     st.title("🧊 Slump Detector")
     st.markdown("**Using SPRT, a statistical test to determine a player's true batting average.**")
     st.markdown("Use cases: fantasy baseball pickups, GM trade decisions, scouting reports for minor leaguers.")
 
 
-    # Load player list
-    players = pd.read_csv(r"data/mlbam_ids.csv")
-    player_names = players['Name'].dropna().unique().tolist()
+    # Load player list (shared, cached name index over data/mlbam_ids.csv)
+    player_names = PlayerIds.load_players()['Name'].dropna().unique().tolist()
 
     # Search input and selection
     search_query = st.text_input("Search player (type part of the name)", "Aaron Judge")
-    matches = [n for n in player_names if search_query.lower() in n.lower()]
+    matches = PlayerIds.search_names(search_query)
 
     if not matches:
         st.warning("No matches found for your search. Showing top players.")
         matches = player_names[:200]  # limit to avoid huge lists
 
     selected_player = st.selectbox("Select player", matches, index=0)
-    player_id = int(players.loc[players['Name'] == selected_player, 'MLBAMID'].values[0])
+    player_id = PlayerIds.id_for_display_name(selected_player)
 
     st.write(f"Selected: {selected_player}")
 
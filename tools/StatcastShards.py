@@ -0,0 +1,228 @@
+import glob
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+import pybaseball as pyb
+import statsapi
+
+from . import NRFIFeatures
+
+##################################################
+# Incremental Statcast ingestion
+# One immutable parquet shard per finished game day (first-inning pitches only),
+# so a nightly run only downloads the days it does not have yet
+##################################################
+
+SHARD_DIR = r'data/statcast_shards'
+SEASON_START = '2026-03-25'
+
+# days pulled at once; each worker holds one full-day pitch frame until it is
+# reduced, so peak memory is about this many days of Statcast, not one
+INGEST_WORKERS = 8
+
+#keep only the columns we need for the model
+SHARD_COLS = ['game_date', 'home_team', 'away_team', 'inning', 'player_name', 'pitcher',
+              'home_score', 'away_score', 'game_pk']
+
+def shard_path(day, shard_dir=SHARD_DIR):
+    return os.path.join(shard_dir, f'{day}.parquet')
+
+def stored_days(shard_dir=SHARD_DIR):
+    return sorted(os.path.basename(p)[:-len('.parquet')] for p in glob.glob(shard_path('*', shard_dir)))
+
+def missing_days(start=SEASON_START, end=None, shard_dir=SHARD_DIR):
+    """
+    Days from start through end (default: yesterday) without a shard.
+    Today is never included: its games are not final yet, and shards are never rewritten.
+    """
+    yesterday = date.today() - timedelta(days=1)
+    end = min(date.fromisoformat(end), yesterday) if end else yesterday
+    day = date.fromisoformat(start)
+    have = set(stored_days(shard_dir))
+    days = []
+    while day <= end:
+        if day.isoformat() not in have:
+            days.append(day.isoformat())
+        day += timedelta(days=1)
+    return days
+
+# compact dtypes for the projected first-inning rows
+SHARD_DTYPES = {'home_team': 'category', 'away_team': 'category', 'inning': 'int8',
+                'player_name': 'category', 'pitcher': 'int32', 'home_score': 'int8',
+                'away_score': 'int8', 'game_pk': 'int32'}
+
+def extract_first_inning(pitches):
+    """
+    Filter, project and downcast one chunk of Statcast pitches, keeping
+    Statcast's order (latest pitch first, so the away starter leads each game).
+    Only the small result outlives the call, so memory is bounded by one chunk.
+    """
+    first = pitches.loc[pitches['inning'] == 1, SHARD_COLS]
+    first = first.astype(SHARD_DTYPES)
+    first['game_date'] = pd.to_datetime(first['game_date'])
+    return first.reset_index(drop=True)
+
+# schedule statuses of a game that was played to the end
+FINAL_STATUSES = {'Final', 'Game Over', 'Completed Early'}
+
+def final_games(day):
+    """
+    Number of games the MLB schedule lists as final on the day (raises if the
+    schedule cannot be fetched).
+    """
+    return sum(game.get('status') in FINAL_STATUSES for game in statsapi.schedule(start_date=day, end_date=day))
+
+def fetch_day(day):
+    """
+    Pull one day of Statcast and reduce it to the first-inning shard.
+
+    Shards are never rewritten, so a pull is only accepted when it holds every
+    game the MLB schedule lists as final (an empty pull only on off days and
+    full rainouts). Otherwise Statcast was down or still missing late games and
+    this raises so the day is retried on the next run.
+    """
+    pitches = pyb.statcast(start_dt=day, end_dt=day, verbose=False, parallel=False)
+    first = extract_first_inning(pitches) if pitches is not None and not pitches.empty \
+        else pd.DataFrame(columns=SHARD_COLS)
+    played, pulled = final_games(day), first['game_pk'].nunique()
+    if pulled < played:
+        raise ValueError(f"Statcast returned {pulled} of the {played} games the schedule lists as final")
+    return first
+
+def write_shard(day, pitches, shard_dir=SHARD_DIR):
+    os.makedirs(shard_dir, exist_ok=True)
+    path = shard_path(day, shard_dir)
+    tmp_path = path + '.tmp'
+    pitches.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+def ingest(start=SEASON_START, end=None, shard_dir=SHARD_DIR, max_workers=INGEST_WORKERS):
+    """
+    Fetch every missing day on a bounded thread pool and write each day's shard
+    as soon as it arrives. A shard is only written once the pull holds every
+    final game on the schedule (days without games get an empty shard so they
+    are not fetched again); a failed or incomplete pull writes nothing and the
+    day is retried on the next run. Delete a shard to force a refetch.
+
+    Parameters
+    - max_workers: days pulled concurrently; peak memory is up to max_workers
+      full-day pitch frames (1 = one day at a time)
+
+    Returns
+    - days written, {day: error} for days that failed (retried on the next run)
+    """
+    days = missing_days(start, end, shard_dir)
+    written, failed = [], {}
+    if not days:
+        return written, failed
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(days))) as pool:
+        futures = {pool.submit(fetch_day, day): day for day in days}
+        for future in as_completed(futures):
+            day = futures[future]
+            try:
+                write_shard(day, future.result(), shard_dir)
+                written.append(day)
+            except Exception as e:
+                failed[day] = e
+    return sorted(written), failed
+
+def iter_shards(start=SEASON_START, end=None, shard_dir=SHARD_DIR):
+    """
+    Yield the stored non-empty shards from start through end (inclusive), one at a time.
+    """
+    for day in stored_days(shard_dir):
+        if day < start or (end is not None and day > end):
+            continue
+        shard = pd.read_parquet(shard_path(day, shard_dir), columns=SHARD_COLS)
+        if not shard.empty:
+            yield shard
+
+def load_shards(start=SEASON_START, end=None, shard_dir=SHARD_DIR):
+    """
+    Concatenate the stored shards from start through end (inclusive) into one
+    first-inning pitch table.
+    """
+    frames = list(iter_shards(start, end, shard_dir))
+    if not frames:
+        return pd.DataFrame(columns=SHARD_COLS)
+    return pd.concat(frames, ignore_index=True)
+
+def build_games(start=SEASON_START, end=None, shard_dir=SHARD_DIR):
+    """
+    Game table built one shard at a time: every first inning is played on a
+    single day, so each shard reduces to its own game rows and only those are
+    kept. Peak memory is one shard plus the (small) game table.
+    """
+    parts = [NRFIFeatures.build_game_table(shard) for shard in iter_shards(start, end, shard_dir)]
+    if not parts:
+        return NRFIFeatures.build_game_table(pd.DataFrame(columns=SHARD_COLS))
+    games = pd.concat(parts, ignore_index=True)
+    games = games.sort_values(NRFIFeatures.GAME_ORDER, kind='stable').drop_duplicates('game_pk').reset_index(drop=True)
+    return NRFIFeatures.compact_game_table(games)
+
+def _synthetic_day(day, games=15, pitches_per_game=290, width=90):
+    # full-width stand-in for one day of Statcast (benchmark only)
+    rng = np.random.default_rng(int(day.replace('-', '')))
+    n = games * pitches_per_game
+    game = np.repeat(np.arange(games), pitches_per_game)
+    pitches = pd.DataFrame({
+        'game_date': pd.Timestamp(day),
+        'home_team': np.array(['BOS', 'NYY', 'TB', 'TOR', 'BAL'] * 3)[game],
+        'away_team': np.array(['SEA', 'HOU', 'TEX', 'LAA', 'ATH'] * 3)[game],
+        'inning': np.tile(np.repeat(np.arange(9, 0, -1), -(-pitches_per_game // 9))[:pitches_per_game], games),
+        'player_name': [f'Pitcher {i}' for i in rng.integers(0, 400, n)],
+        'pitcher': rng.integers(400000, 700000, n),
+        'home_score': rng.integers(0, 3, n),
+        'away_score': rng.integers(0, 3, n),
+        'game_pk': int(day.replace('-', '')) * 100 + game,
+        'des': ['Ball in the dirt.'] * n,
+    })
+    filler = pd.DataFrame(rng.random((n, width - pitches.shape[1])),
+                          columns=[f'col_{i}' for i in range(width - pitches.shape[1])])
+    return pd.concat([pitches, filler], axis=1)
+
+def _benchmark_run(mode, n_days, workers=INGEST_WORKERS):
+    import resource
+    import tempfile
+
+    days = [(date.fromisoformat(SEASON_START) + timedelta(days=i)).isoformat() for i in range(n_days)]
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if mode == 'season':
+        # the old nrfi.py: the whole season in one frame, then filter and project
+        season = pd.concat([_synthetic_day(day) for day in days], ignore_index=True)
+        games = NRFIFeatures.build_game_table(season.loc[season['inning'] == 1, SHARD_COLS].reset_index(drop=True))
+    else:
+        def statcast(start_dt, end_dt, verbose, parallel):
+            # hold the full day for a moment, as a real download and parse would, so workers overlap
+            pitches = _synthetic_day(start_dt)
+            time.sleep(0.05)
+            return pitches
+
+        pyb.statcast = statcast
+        statsapi.schedule = lambda start_date, end_date: [{'status': 'Final'}] * 15
+        with tempfile.TemporaryDirectory() as shard_dir:
+            ingest(start=days[0], end=days[-1], shard_dir=shard_dir, max_workers=workers)
+            games = build_games(start=days[0], shard_dir=shard_dir)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    label = mode if mode == 'season' else f"{mode} x{workers}"
+    print(f"{label:>10} {n_days:>4} days {len(games):>6} games  peak RSS +{(peak - baseline) / 1024:.0f} MB")
+
+if __name__ == '__main__':
+    # Peak memory of the old whole-season extraction vs the per-day streaming one
+    # with one worker and with INGEST_WORKERS (what nrfi.py runs), on synthetic
+    # full-width days (no network), each run in a fresh process:
+    #   python -m tools.StatcastShards --benchmark 30 90 180
+    import subprocess
+    import sys
+
+    if sys.argv[1] == '--run':
+        _benchmark_run(sys.argv[2], int(sys.argv[3]), int(sys.argv[4]))
+    elif sys.argv[1] == '--benchmark':
+        for n_days in sys.argv[2:] or ['30', '90', '180']:
+            for mode, workers in [('season', 1), ('stream', 1), ('stream', INGEST_WORKERS)]:
+                subprocess.run([sys.executable, '-m', 'tools.StatcastShards', '--run', mode, n_days, str(workers)],
+                               check=True)